@@ -0,0 +1,30 @@
+"""add_vendor_keyset_pagination_indexes
+
+Revision ID: a1f3c9d27b40
+Revises: 648c122189ce
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f3c9d27b40'
+down_revision = '648c122189ce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_vendors_status_id', 'vendors', ['status', 'id'], unique=False)
+    op.create_index('ix_vendors_supplier_type_id', 'vendors', ['supplier_type', 'id'], unique=False)
+    op.create_index('ix_vendors_msme_status_id', 'vendors', ['msme_status', 'id'], unique=False)
+    op.create_index('ix_vendors_supplier_category_id', 'vendors', ['supplier_category', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vendors_supplier_category_id', table_name='vendors')
+    op.drop_index('ix_vendors_msme_status_id', table_name='vendors')
+    op.drop_index('ix_vendors_supplier_type_id', table_name='vendors')
+    op.drop_index('ix_vendors_status_id', table_name='vendors')
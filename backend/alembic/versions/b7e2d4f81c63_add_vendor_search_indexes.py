@@ -0,0 +1,48 @@
+"""add_vendor_search_indexes
+
+Revision ID: b7e2d4f81c63
+Revises: a1f3c9d27b40
+Create Date: 2026-10-17 11:03:12.540371
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d4f81c63'
+down_revision = 'a1f3c9d27b40'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ('company_name', 'contact_person_name', 'email', 'vendor_code')
+
+# Must match PG_SEARCH_DOCUMENT in app/utils/vendor_search.py
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple', "
+    + " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS)
+    + ")"
+)
+
+
+def upgrade() -> None:
+    # SQLite builds its FTS5 search table at application startup instead
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_vendors_{column}_trgm "
+            f"ON vendors USING gin ({column} gin_trgm_ops)"
+        )
+    op.execute(f"CREATE INDEX IF NOT EXISTS ix_vendors_search_document ON vendors USING gin ({SEARCH_DOCUMENT})")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_vendors_search_document")
+    for column in SEARCH_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_vendors_{column}_trgm")
@@ -0,0 +1,94 @@
+"""add_status_rollups
+
+Revision ID: c5a8e1d9f372
+Revises: b7e2d4f81c63
+Create Date: 2026-10-17 14:22:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a8e1d9f372'
+down_revision = 'b7e2d4f81c63'
+branch_labels = None
+depends_on = None
+
+# Must match ROLLUP_KEYS in app/utils/status_rollup.py
+ROLLUP_KEYS = {
+    'vendor': ('vendors', "coalesce(CAST({row}.status AS VARCHAR), '')"),
+    'approval': (
+        'vendor_approvals',
+        "coalesce(CAST({row}.level AS VARCHAR), '') || ':' || coalesce(CAST({row}.status AS VARCHAR), '')"
+    ),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'status_rollups',
+        sa.Column('scope', sa.String(length=32), nullable=False),
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'key')
+    )
+
+    # SQLite installs its counter triggers at application startup instead
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_status_rollup(p_scope text, p_key text, p_delta integer)
+        RETURNS void AS $$
+        BEGIN
+            INSERT INTO status_rollups (scope, key, count) VALUES (p_scope, p_key, p_delta)
+            ON CONFLICT (scope, key) DO UPDATE SET count = status_rollups.count + EXCLUDED.count;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for scope, (table, key) in ROLLUP_KEYS.items():
+        new_key, old_key = key.format(row='NEW'), key.format(row='OLD')
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_rollup() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    PERFORM bump_status_rollup('{scope}', {old_key}, -1);
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    PERFORM bump_status_rollup('{scope}', {new_key}, 1);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_rollup AFTER INSERT OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_rollup()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_rollup_update AFTER UPDATE ON {table}
+            FOR EACH ROW WHEN ({old_key} IS DISTINCT FROM {new_key})
+            EXECUTE FUNCTION {table}_rollup()
+        """)
+        op.execute(
+            f"INSERT INTO status_rollups (scope, key, count) "
+            f"SELECT '{scope}', {key.format(row=table)}, count(*) FROM {table} "
+            f"GROUP BY {key.format(row=table)}"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for table, _ in ROLLUP_KEYS.values():
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_rollup_update ON {table}")
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_rollup ON {table}")
+            op.execute(f"DROP FUNCTION IF EXISTS {table}_rollup()")
+        op.execute("DROP FUNCTION IF EXISTS bump_status_rollup(text, text, integer)")
+    else:
+        for table, _ in ROLLUP_KEYS.values():
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_rollup_{suffix}")
+
+    op.drop_table('status_rollups')
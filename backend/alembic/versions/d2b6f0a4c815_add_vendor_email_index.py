@@ -0,0 +1,24 @@
+"""add_vendor_email_index
+
+Revision ID: d2b6f0a4c815
+Revises: c5a8e1d9f372
+Create Date: 2026-10-17 16:40:09.530117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b6f0a4c815'
+down_revision = 'c5a8e1d9f372'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_vendors_email', 'vendors', ['email'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vendors_email', table_name='vendors')
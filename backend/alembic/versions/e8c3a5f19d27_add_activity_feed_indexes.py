@@ -0,0 +1,31 @@
+"""add_activity_feed_indexes
+
+Revision ID: e8c3a5f19d27
+Revises: d2b6f0a4c815
+Create Date: 2026-10-17 18:05:41.207316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c3a5f19d27'
+down_revision = 'd2b6f0a4c815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_vendors_created_at_id', 'vendors', ['created_at', 'id'], unique=False)
+    op.create_index('ix_vendor_documents_created_at_id', 'vendor_documents', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_vendor_approvals_status_activity', 'vendor_approvals',
+        ['status', sa.text('coalesce(approved_at, created_at)'), 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vendor_approvals_status_activity', table_name='vendor_approvals')
+    op.drop_index('ix_vendor_documents_created_at_id', table_name='vendor_documents')
+    op.drop_index('ix_vendors_created_at_id', table_name='vendors')
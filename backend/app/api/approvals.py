@@ -1,19 +1,21 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import func, case, and_
 from ..database import get_db
 from ..models.user import User
 from ..models.vendor import Vendor, VendorStatus
 from ..models.vendor_approval import VendorApproval, ApprovalStatus, ApprovalLevel
 from ..schemas.vendor_approval import VendorApprovalCreate, VendorApprovalUpdate, VendorApprovalResponse
 from ..auth import get_current_active_user
+from ..utils.status_rollup import get_status_counts, VENDOR_SCOPE
 from datetime import datetime
 
 router = APIRouter(prefix="/approvals", tags=["approvals"])
 
 
 @router.get("/pending", response_model=List[VendorApprovalResponse])
-async def get_pending_approvals(
+def get_pending_approvals(
     skip: int = Query(0, ge=0),
     limit: int = Query(25, ge=1, le=100),
     level: Optional[ApprovalLevel] = None,
@@ -34,7 +36,7 @@ async def get_pending_approvals(
 
 
 @router.get("/vendor/{vendor_id}", response_model=List[VendorApprovalResponse])
-async def get_vendor_approvals(
+def get_vendor_approvals(
     vendor_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -51,7 +53,7 @@ async def get_vendor_approvals(
 
 
 @router.get("/vendor/{vendor_id}/public", response_model=List[VendorApprovalResponse])
-async def get_vendor_approvals_public(
+def get_vendor_approvals_public(
     vendor_id: int,
     db: Session = Depends(get_db)
 ):
@@ -67,7 +69,7 @@ async def get_vendor_approvals_public(
 
 
 @router.post("/vendor/{vendor_id}", response_model=VendorApprovalResponse)
-async def create_vendor_approval(
+def create_vendor_approval(
     vendor_id: int,
     approval_data: VendorApprovalCreate,
     db: Session = Depends(get_db)
@@ -145,7 +147,7 @@ async def create_vendor_approval(
 
 
 @router.put("/{approval_id}", response_model=VendorApprovalResponse)
-async def update_approval(
+def update_approval(
     approval_id: int,
     approval_data: VendorApprovalUpdate,
     db: Session = Depends(get_db),
@@ -205,7 +207,7 @@ async def update_approval(
 
 
 @router.get("/stats")
-async def get_approval_stats(
+def get_approval_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -234,7 +236,7 @@ async def get_approval_stats(
 
 
 @router.get("/workflow-stats")
-async def get_workflow_stats(
+def get_workflow_stats(
     db: Session = Depends(get_db)
     # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
 ):
@@ -250,28 +252,32 @@ async def get_workflow_stats(
     week_ago = today - timedelta(days=7)
     week_ago_start = datetime.combine(week_ago, datetime.min.time())
     
+    # Pending levels come from the trigger-maintained status counters
+    vendor_counts = get_status_counts(db, VENDOR_SCOPE)
+    
     # Pending Level 1 - vendors with status 'pending'
-    pending_level_1 = db.query(Vendor).filter(
-        Vendor.status == VendorStatus.PENDING
-    ).count()
+    pending_level_1 = vendor_counts.get(VendorStatus.PENDING.name, 0)
     
     # Pending Level 2 - vendors with status 'under_review'
-    pending_level_2 = db.query(Vendor).filter(
-        Vendor.status == VendorStatus.UNDER_REVIEW
-    ).count()
+    pending_level_2 = vendor_counts.get(VendorStatus.UNDER_REVIEW.name, 0)
     
-    # Approved Today - vendors approved today
-    approved_today = db.query(Vendor).filter(
-        Vendor.status == VendorStatus.APPROVED,
-        Vendor.approved_at >= today_start,
-        Vendor.approved_at <= today_end
-    ).count()
-    
-    # Rejected This Week - vendors rejected in the last 7 days
-    rejected_this_week = db.query(Vendor).filter(
-        Vendor.status == VendorStatus.REJECTED,
-        Vendor.updated_at >= week_ago_start
-    ).count()
+    # Approved today / rejected in the last 7 days are time-windowed, so
+    # they are counted live, together in one query
+    recent = db.query(
+        func.count(case((and_(
+            Vendor.status == VendorStatus.APPROVED,
+            Vendor.approved_at >= today_start,
+            Vendor.approved_at <= today_end
+        ), 1))).label("approved_today"),
+        func.count(case((and_(
+            Vendor.status == VendorStatus.REJECTED,
+            Vendor.updated_at >= week_ago_start
+        ), 1))).label("rejected_this_week")
+    ).filter(
+        Vendor.status.in_([VendorStatus.APPROVED, VendorStatus.REJECTED])
+    ).one()
+    approved_today = recent.approved_today
+    rejected_this_week = recent.rejected_this_week
     
     return {
         "pendingLevel1": pending_level_1,
@@ -1,83 +1,92 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
-from datetime import datetime, timedelta
+from sqlalchemy import func, and_, or_, extract, case, exists, null, type_coerce, String
+from datetime import date, datetime, timedelta
 from ..database import get_db
 from ..models.vendor import Vendor, VendorStatus
-from ..models.vendor_approval import VendorApproval, ApprovalStatus
-from ..models.vendor_document import VendorDocument
+from ..models.vendor_approval import VendorApproval, ApprovalStatus, ApprovalLevel
+from ..models.vendor_document import VendorDocument, DocumentType
 from ..auth import get_current_active_user
+from ..config import settings
+from ..utils.cache import TTLCache, invalidate_on_commit
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.status_rollup import get_status_counts, approval_key, VENDOR_SCOPE, APPROVAL_SCOPE
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
+# Dashboard aggregates are shared by every open dashboard; recompute them at
+# most once per TTL, or right after a write to the tables they summarize
+dashboard_cache = TTLCache(settings.dashboard_cache_ttl)
+invalidate_on_commit(dashboard_cache, (Vendor, VendorDocument, VendorApproval))
+
+ONBOARDING_TRENDS_MAX_MONTHS = 120
+
+
+def compute_dashboard_metrics(db: Session) -> Dict[str, Any]:
+    """Compute all dashboard metrics with a single conditional-aggregation query"""
+    now = datetime.utcnow()
+    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_month = start_of_month - timedelta(days=1)
+    last_month_start = last_month.replace(day=1)
+    
+    has_documents = exists().where(VendorDocument.vendor_id == Vendor.id)
+    
+    row = db.query(
+        func.count(Vendor.id).label("total_vendors"),
+        func.count(case((Vendor.status == VendorStatus.PENDING, 1))).label("pending_approvals"),
+        func.count(case((Vendor.created_at >= start_of_month, 1))).label("this_month_onboarded"),
+        func.count(case((
+            and_(Vendor.created_at >= last_month_start, Vendor.created_at < start_of_month), 1
+        ))).label("last_month_onboarded"),
+        # Compliance rate (vendors with documents)
+        func.count(case((has_documents, 1))).label("vendors_with_documents")
+    ).one()
+    
+    total_vendors = row.total_vendors
+    pending_approvals = row.pending_approvals
+    this_month_onboarded = row.this_month_onboarded
+    last_month_onboarded = row.last_month_onboarded
+    
+    compliance_rate = (row.vendors_with_documents / total_vendors * 100) if total_vendors > 0 else 0
+    
+    # Calculate percentage changes
+    vendor_change = ((total_vendors - (total_vendors - this_month_onboarded)) / (total_vendors - this_month_onboarded) * 100) if (total_vendors - this_month_onboarded) > 0 else 0
+    onboarding_change = ((this_month_onboarded - last_month_onboarded) / last_month_onboarded * 100) if last_month_onboarded > 0 else 0
+    compliance_change = 2.1  # Mock change for now
+    
+    return {
+        "totalVendors": {
+            "value": total_vendors,
+            "change": f"+{vendor_change:.1f}%" if vendor_change > 0 else f"{vendor_change:.1f}%",
+            "changeType": "positive" if vendor_change > 0 else "negative"
+        },
+        "pendingApprovals": {
+            "value": pending_approvals,
+            "change": f"+{pending_approvals}",
+            "changeType": "neutral"
+        },
+        "thisMonthOnboarded": {
+            "value": this_month_onboarded,
+            "change": f"+{onboarding_change:.1f}%" if onboarding_change > 0 else f"{onboarding_change:.1f}%",
+            "changeType": "positive" if onboarding_change > 0 else "negative"
+        },
+        "complianceRate": {
+            "value": f"{compliance_rate:.1f}%",
+            "change": f"+{compliance_change}%",
+            "changeType": "positive"
+        }
+    }
+
 
 @router.get("/metrics")
-async def get_dashboard_metrics(
+def get_dashboard_metrics(
     db: Session = Depends(get_db)
     # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
 ):
     """Get dashboard metrics"""
     try:
-        # Total vendors
-        total_vendors = db.query(Vendor).count()
-        
-        # Pending approvals (vendors with pending status)
-        pending_approvals = db.query(Vendor).filter(
-            Vendor.status == VendorStatus.PENDING
-        ).count()
-        
-        # This month onboarded (vendors created this month)
-        now = datetime.utcnow()
-        start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        this_month_onboarded = db.query(Vendor).filter(
-            Vendor.created_at >= start_of_month
-        ).count()
-        
-        # Compliance rate (vendors with documents)
-        vendors_with_documents = db.query(Vendor).join(
-            VendorDocument, Vendor.id == VendorDocument.vendor_id
-        ).distinct().count()
-        
-        compliance_rate = (vendors_with_documents / total_vendors * 100) if total_vendors > 0 else 0
-        
-        # Calculate changes (comparing with last month)
-        last_month = start_of_month - timedelta(days=1)
-        last_month_start = last_month.replace(day=1)
-        last_month_onboarded = db.query(Vendor).filter(
-            and_(
-                Vendor.created_at >= last_month_start,
-                Vendor.created_at < start_of_month
-            )
-        ).count()
-        
-        # Calculate percentage changes
-        vendor_change = ((total_vendors - (total_vendors - this_month_onboarded)) / (total_vendors - this_month_onboarded) * 100) if (total_vendors - this_month_onboarded) > 0 else 0
-        onboarding_change = ((this_month_onboarded - last_month_onboarded) / last_month_onboarded * 100) if last_month_onboarded > 0 else 0
-        compliance_change = 2.1  # Mock change for now
-        
-        return {
-            "totalVendors": {
-                "value": total_vendors,
-                "change": f"+{vendor_change:.1f}%" if vendor_change > 0 else f"{vendor_change:.1f}%",
-                "changeType": "positive" if vendor_change > 0 else "negative"
-            },
-            "pendingApprovals": {
-                "value": pending_approvals,
-                "change": f"+{pending_approvals}",
-                "changeType": "neutral"
-            },
-            "thisMonthOnboarded": {
-                "value": this_month_onboarded,
-                "change": f"+{onboarding_change:.1f}%" if onboarding_change > 0 else f"{onboarding_change:.1f}%",
-                "changeType": "positive" if onboarding_change > 0 else "negative"
-            },
-            "complianceRate": {
-                "value": f"{compliance_rate:.1f}%",
-                "change": f"+{compliance_change}%",
-                "changeType": "positive"
-            }
-        }
+        return dashboard_cache.get_or_compute("metrics", lambda: compute_dashboard_metrics(db))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -86,7 +95,7 @@ async def get_dashboard_metrics(
 
 
 @router.get("/vendor-distribution")
-async def get_vendor_distribution(
+def get_vendor_distribution(
     db: Session = Depends(get_db)
 ):
     """Get vendor distribution by category"""
@@ -133,57 +142,77 @@ async def get_vendor_distribution(
         )
 
 
+def shift_month(month_start: datetime, months: int) -> datetime:
+    """Return the first day of the month `months` away from month_start"""
+    index = month_start.year * 12 + (month_start.month - 1) + months
+    return month_start.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def month_bucket(db: Session, column):
+    """Per-dialect expression truncating a timestamp column to its month"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(func.date_trunc("month", column), "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
 @router.get("/onboarding-trends")
-async def get_onboarding_trends(
-    months: int = 6,
+def get_onboarding_trends(
+    months: int = Query(6, ge=1, le=ONBOARDING_TRENDS_MAX_MONTHS),
+    start_date: Optional[date] = Query(None, description="First month of the range (defaults to `months` back from now)"),
+    end_date: Optional[date] = Query(None, description="Last month of the range (defaults to the current month)"),
     db: Session = Depends(get_db)
 ):
-    """Get vendor onboarding trends for the specified number of months"""
-    try:
-        now = datetime.utcnow()
-        data = []
+    """Get vendor onboarding trends per calendar month, oldest first"""
+    now = datetime.utcnow()
+    current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    
+    last_month = datetime(end_date.year, end_date.month, 1) if end_date else current_month
+    first_month = datetime(start_date.year, start_date.month, 1) if start_date else shift_month(last_month, -(months - 1))
+    month_count = (last_month.year - first_month.year) * 12 + last_month.month - first_month.month + 1
+    if month_count < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date"
+        )
+    if month_count > ONBOARDING_TRENDS_MAX_MONTHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range can span at most {ONBOARDING_TRENDS_MAX_MONTHS} months"
+        )
+    range_end = shift_month(last_month, 1)
+    
+    def compute():
+        # The current month counts up to now; cut off here so the cache key stays the calendar month
+        cutoff = min(range_end, datetime.utcnow())
+        bucket = month_bucket(db, Vendor.created_at).label("period")
+        rows = db.query(
+            bucket,
+            func.count(Vendor.id).label("vendors"),
+            func.count(case((Vendor.status == VendorStatus.APPROVED, 1))).label("approved")
+        ).filter(
+            Vendor.created_at >= first_month,
+            Vendor.created_at < cutoff
+        ).group_by(bucket).all()
+        counts = {row.period: row for row in rows}
         
-        for i in range(months):
-            # Calculate month start and end
-            month_start = (now - timedelta(days=30*i)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            if i == 0:
-                month_end = now
-            else:
-                month_end = (now - timedelta(days=30*(i-1))).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            
-            # Get vendors created in this month
-            total_vendors = db.query(Vendor).filter(
-                and_(
-                    Vendor.created_at >= month_start,
-                    Vendor.created_at < month_end
-                )
-            ).count()
-            
-            # Get approved vendors in this month
-            approved_vendors = db.query(Vendor).filter(
-                and_(
-                    Vendor.created_at >= month_start,
-                    Vendor.created_at < month_end,
-                    Vendor.status == VendorStatus.APPROVED
-                )
-            ).count()
-            
-            # Pending vendors in this month
-            pending_vendors = total_vendors - approved_vendors
-            
-            month_name = month_start.strftime('%b')
-            
+        data = []
+        for i in range(month_count):
+            month_start = shift_month(first_month, i)
+            period = month_start.strftime("%Y-%m")
+            row = counts.get(period)
+            total_vendors = row.vendors if row else 0
+            approved_vendors = row.approved if row else 0
             data.append({
-                "month": month_name,
+                "month": month_start.strftime("%b"),
+                "period": period,
                 "vendors": total_vendors,
                 "approved": approved_vendors,
-                "pending": pending_vendors
+                "pending": total_vendors - approved_vendors
             })
-        
-        # Reverse to show oldest first
-        data.reverse()
-        
         return data
+    
+    try:
+        return dashboard_cache.get_or_compute(("onboarding-trends", first_month, range_end), compute)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -192,31 +221,20 @@ async def get_onboarding_trends(
 
 
 @router.get("/approval-workflow-status")
-async def get_approval_workflow_status(
+def get_approval_workflow_status(
     db: Session = Depends(get_db)
 ):
     """Get approval workflow status breakdown"""
     try:
-        # Count vendors by status
-        submitted = db.query(Vendor).filter(
-            Vendor.status == VendorStatus.PENDING
-        ).count()
-        
-        l1_review = db.query(Vendor).filter(
-            Vendor.status == VendorStatus.UNDER_REVIEW
-        ).count()
-        
-        l2_review = db.query(Vendor).filter(
-            Vendor.status == VendorStatus.UNDER_REVIEW
-        ).count()  # This could be refined based on approval levels
-        
-        approved = db.query(Vendor).filter(
-            Vendor.status == VendorStatus.APPROVED
-        ).count()
+        # O(1) reads from the trigger-maintained status counters
+        vendor_counts = get_status_counts(db, VENDOR_SCOPE)
+        approval_counts = get_status_counts(db, APPROVAL_SCOPE)
         
-        rejected = db.query(Vendor).filter(
-            Vendor.status == VendorStatus.REJECTED
-        ).count()
+        submitted = vendor_counts.get(VendorStatus.PENDING.name, 0)
+        l1_review = approval_counts.get(approval_key(ApprovalLevel.LEVEL_1, ApprovalStatus.PENDING), 0)
+        l2_review = approval_counts.get(approval_key(ApprovalLevel.LEVEL_2, ApprovalStatus.PENDING), 0)
+        approved = vendor_counts.get(VendorStatus.APPROVED.name, 0)
+        rejected = vendor_counts.get(VendorStatus.REJECTED.name, 0)
         
         data = [
             {"stage": "Submitted", "count": submitted, "color": "#64748B"},
@@ -234,79 +252,133 @@ async def get_approval_workflow_status(
         )
 
 
+# Presentation for each activity kind in the recent-activities feed
+ACTIVITY_KINDS = {
+    "vendor": {
+        "type": "vendor_submitted",
+        "title": "New Vendor Registration",
+        "icon": "UserPlus",
+        "color": "text-primary",
+        "bgColor": "bg-primary/10"
+    },
+    "approval": {
+        "type": "vendor_approved",
+        "title": "Vendor Approved",
+        "icon": "CheckCircle",
+        "color": "text-success",
+        "bgColor": "bg-success/10"
+    },
+    "document": {
+        "type": "document_uploaded",
+        "title": "Document Uploaded",
+        "icon": "FileText",
+        "color": "text-accent",
+        "bgColor": "bg-accent/10"
+    }
+}
+
+
+def activity_sort_key(db: Session, column):
+    """Timestamp expression the activity feed is ordered and paged by
+
+    SQLite stores timestamps as text in more than one format (with and without
+    microseconds); the stored text itself is used there, which orders instants
+    correctly, breaks ties consistently and can still be read from an index.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return type_coerce(column, String)
+    return column
+
+
 @router.get("/recent-activities")
-async def get_recent_activities(
-    limit: int = 10,
+def get_recent_activities(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page, to load older activities"
+    ),
     db: Session = Depends(get_db)
 ):
-    """Get recent activities for the dashboard"""
+    """Get recent activities for the dashboard, newest first"""
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+            last_key = position["ts"]
+            if db.get_bind().dialect.name != "sqlite":
+                last_key = datetime.fromisoformat(last_key)
+            last_kind, last_id = str(position["kind"]), int(position["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid activities cursor"
+            )
+    
+    def newest(kind, source, occurred_at, detail, *criteria):
+        """Up to limit + 1 activities of one kind after the cursor, in feed order"""
+        sort_key = activity_sort_key(db, occurred_at)
+        query = db.query(
+            source.id.label("source_id"),
+            occurred_at.label("occurred_at"),
+            detail.label("detail"),
+            sort_key.label("sort_key"),
+            Vendor.company_name
+        ).filter(*criteria)
+        if source is not Vendor:
+            query = query.join(Vendor, Vendor.id == source.vendor_id)
+        if position:
+            # Feed order is (timestamp, kind, id) descending, and kind is fixed in this branch
+            if kind < last_kind:
+                query = query.filter(sort_key <= last_key)
+            elif kind == last_kind:
+                query = query.filter(or_(sort_key < last_key, and_(sort_key == last_key, source.id < last_id)))
+            else:
+                query = query.filter(sort_key < last_key)
+        rows = query.order_by(sort_key.desc(), source.id.desc()).limit(limit + 1).all()
+        return [(row.sort_key, kind, row.source_id, row) for row in rows if row.sort_key is not None]
+    
     try:
-        activities = []
-        
-        # Get recent vendor registrations
-        recent_vendors = db.query(Vendor).order_by(
-            Vendor.created_at.desc()
-        ).limit(limit).all()
-        
-        for vendor in recent_vendors:
-            activities.append({
-                "id": f"vendor_{vendor.id}",
-                "type": "vendor_submitted",
-                "title": "New Vendor Registration",
-                "description": f"{vendor.company_name} submitted registration form",
-                "timestamp": vendor.created_at.isoformat(),
-                "icon": "UserPlus",
-                "color": "text-primary",
-                "bgColor": "bg-primary/10"
-            })
-        
-        # Get recent approvals
-        recent_approvals = db.query(VendorApproval).filter(
-            VendorApproval.status == ApprovalStatus.APPROVED
-        ).order_by(
-            VendorApproval.approved_at.desc()
-        ).limit(limit).all()
-        
-        for approval in recent_approvals:
-            vendor = db.query(Vendor).filter(Vendor.id == approval.vendor_id).first()
-            if vendor:
-                activities.append({
-                    "id": f"approval_{approval.id}",
-                    "type": "vendor_approved",
-                    "title": "Vendor Approved",
-                    "description": f"{vendor.company_name} has been approved",
-                    "timestamp": approval.approved_at.isoformat() if approval.approved_at else approval.created_at.isoformat(),
-                    "icon": "CheckCircle",
-                    "color": "text-success",
-                    "bgColor": "bg-success/10"
-                })
-        
-        # Get recent document uploads
-        recent_documents = db.query(VendorDocument).order_by(
-            VendorDocument.created_at.desc()
-        ).limit(limit).all()
-        
-        for document in recent_documents:
-            vendor = db.query(Vendor).filter(Vendor.id == document.vendor_id).first()
-            if vendor:
-                activities.append({
-                    "id": f"document_{document.id}",
-                    "type": "document_uploaded",
-                    "title": "Document Uploaded",
-                    "description": f"{vendor.company_name} uploaded {document.document_type.value}",
-                    "timestamp": document.created_at.isoformat(),
-                    "icon": "FileText",
-                    "color": "text-accent",
-                    "bgColor": "bg-accent/10"
-                })
-        
-        # Sort all activities by timestamp and take the most recent
-        activities.sort(key=lambda x: x["timestamp"], reverse=True)
-        activities = activities[:limit]
-        
-        return activities
+        # Each kind reads at most limit + 1 rows from its own index; the merge picks the page
+        candidates = (
+            newest("vendor", Vendor, Vendor.created_at, null())
+            + newest(
+                "approval", VendorApproval,
+                func.coalesce(VendorApproval.approved_at, VendorApproval.created_at), null(),
+                VendorApproval.status == ApprovalStatus.APPROVED
+            )
+            + newest("document", VendorDocument, VendorDocument.created_at, VendorDocument.document_type)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching recent activities: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+    candidates.sort(key=lambda candidate: candidate[:3], reverse=True)
+    rows = [(kind, row) for _, kind, _, row in candidates[:limit + 1]]
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_kind, last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor({
+            "ts": last.sort_key.isoformat() if isinstance(last.sort_key, datetime) else last.sort_key,
+            "kind": last_kind,
+            "id": last.source_id
+        })
+    
+    data = []
+    for kind, row in rows:
+        if kind == "vendor":
+            description = f"{row.company_name} submitted registration form"
+        elif kind == "approval":
+            description = f"{row.company_name} has been approved"
+        else:
+            description = f"{row.company_name} uploaded {row.detail.value}"
+        data.append({
+            "id": f"{kind}_{row.source_id}",
+            **ACTIVITY_KINDS[kind],
+            "description": description,
+            "timestamp": row.occurred_at.isoformat() if row.occurred_at else None
+        })
+    
+    return data
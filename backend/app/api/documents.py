@@ -33,7 +33,7 @@ def save_upload_file(upload_file: UploadFile, vendor_id: int) -> str:
 
 
 @router.post("/upload/{vendor_id}", response_model=VendorDocumentResponse)
-async def upload_document(
+def upload_document(
     vendor_id: int,
     document_type: DocumentType,
     file: UploadFile = File(...),
@@ -89,7 +89,7 @@ async def upload_document(
 
 
 @router.post("/upload/{vendor_id}/public", response_model=VendorDocumentResponse)
-async def upload_document_public(
+def upload_document_public(
     vendor_id: int,
     document_type: DocumentType,
     file: UploadFile = File(...),
@@ -144,7 +144,7 @@ async def upload_document_public(
 
 
 @router.get("/vendor/{vendor_id}", response_model=List[VendorDocumentResponse])
-async def get_vendor_documents(
+def get_vendor_documents(
     vendor_id: int,
     document_type: Optional[DocumentType] = None,
     status: Optional[DocumentStatus] = None,
@@ -171,7 +171,7 @@ async def get_vendor_documents(
 
 
 @router.get("/{document_id}", response_model=VendorDocumentResponse)
-async def get_document(
+def get_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -188,7 +188,7 @@ async def get_document(
 
 
 @router.get("/{document_id}/download")
-async def download_document(
+def download_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -223,7 +223,7 @@ async def download_document(
 
 
 @router.put("/{document_id}", response_model=VendorDocumentResponse)
-async def update_document(
+def update_document(
     document_id: int,
     document_data: VendorDocumentUpdate,
     db: Session = Depends(get_db),
@@ -253,7 +253,7 @@ async def update_document(
 
 
 @router.delete("/{document_id}")
-async def delete_document(
+def delete_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -285,7 +285,7 @@ async def get_document_types():
 
 
 @router.get("/stats/vendor/{vendor_id}")
-async def get_vendor_document_stats(
+def get_vendor_document_stats(
     vendor_id: int,
     db: Session = Depends(get_db)
 ):
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from ..database import get_pool_stats
+from ..utils.request_metrics import route_metrics
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/db-pool", include_in_schema=False)
+async def get_db_pool_metrics():
+    """Live connection pool metrics for the worker that serves the request"""
+    return get_pool_stats()
+
+
+@router.get("/route-metrics", include_in_schema=False)
+async def get_route_metrics():
+    """Per-route request metrics of this worker since the last performance log summary"""
+    return route_metrics.snapshot()
@@ -1,12 +1,16 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import List, Optional, Dict
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response, UploadFile, File, Form
+from fastapi.responses import StreamingResponse, FileResponse
+from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, select, union_all, update, delete
 from ..database import get_db
 from ..models.user import User
 from ..models.vendor import Vendor, VendorStatus, VendorType, MSMEStatus, VendorAddress, VendorBankInfo, VendorCompliance, VendorAgreement, VendorAgreementDetail, VendorComplianceCertificate
+from ..models.vendor_document import VendorDocument
 from ..schemas.vendor import (
-    VendorCreate, VendorUpdate, VendorResponse, VendorListResponse,
+    VendorCreate, VendorUpdate, VendorResponse, VendorListResponse, VendorDetailResponse, VendorBatchResponse,
     VendorAddressCreate, VendorAddressUpdate, VendorAddressResponse,
     VendorBankInfoCreate, VendorBankInfoUpdate, VendorBankInfoResponse,
     VendorComplianceCreate, VendorComplianceUpdate, VendorComplianceResponse,
@@ -15,7 +19,19 @@ from ..schemas.vendor import (
     VendorComplianceCertificateCreate, VendorComplianceCertificateUpdate, VendorComplianceCertificateResponse
 )
 from ..auth import get_current_active_user
+from ..config import settings
+from ..utils.azure_storage import azure_storage
 from ..utils.logger import compliance_logger
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.vendor_search import apply_vendor_search
+from ..utils.export_jobs import export_jobs
+from ..utils.import_jobs import import_jobs
+from ..utils.vendor_import import iter_csv_rows, iter_excel_rows, import_vendor_rows
+from ..utils.vendor_export import (
+    export_query, iter_export_rows, iter_export_records, stream_csv, stream_ndjson, write_excel,
+    new_excel_tempfile, estimate_column_widths, EXCEL_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+)
+import os
 import uuid
 from datetime import datetime
 
@@ -27,8 +43,85 @@ def generate_vendor_code() -> str:
     return f"VND{str(uuid.uuid4())[:8].upper()}"
 
 
+# Related records that GET /vendors/{vendor_id}?include= can embed, with their schemas
+VENDOR_INCLUDES = {
+    "addresses": VendorAddressResponse,
+    "bank_info": VendorBankInfoResponse,
+    "compliance_certificates": VendorComplianceCertificateResponse,
+    "agreement_details": VendorAgreementDetailResponse,
+}
+
+
+def parse_vendor_includes(include: Optional[str]) -> List[str]:
+    """Parse and validate a comma-separated include parameter"""
+    if not include:
+        return []
+    
+    includes = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = [name for name in includes if name not in VENDOR_INCLUDES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(unknown)}. Allowed: {', '.join(VENDOR_INCLUDES)}"
+        )
+    return list(dict.fromkeys(includes))
+
+
+def vendor_count_columns():
+    """Correlated scalar subqueries for the UI badge counts of each vendor row"""
+    def count_of(model, label):
+        return (
+            select(func.count(model.id))
+            .where(model.vendor_id == Vendor.id)
+            .correlate(Vendor)
+            .scalar_subquery()
+            .label(label)
+        )
+    
+    return [
+        count_of(VendorDocument, "document_count"),
+        count_of(VendorCompliance, "compliance_count"),
+        count_of(VendorAgreement, "agreement_count"),
+    ]
+
+
+def load_vendor_detail(db: Session, vendor_id: int, includes: List[str]) -> Optional[Vendor]:
+    """Load a vendor and its badge counts in one query, eager-loading requested relations"""
+    query = db.query(Vendor, *vendor_count_columns()).filter(Vendor.id == vendor_id)
+    for name in includes:
+        query = query.options(selectinload(getattr(Vendor, name)))
+    
+    row = query.first()
+    if not row:
+        return None
+    
+    vendor, vendor.document_count, vendor.compliance_count, vendor.agreement_count = row
+    return vendor
+
+
+def grouped_counts(db: Session, model, vendor_ids: List[int]) -> Dict[int, int]:
+    """Count child rows per vendor for a set of vendors in one GROUP BY query"""
+    rows = db.query(model.vendor_id, func.count(model.id)).filter(
+        model.vendor_id.in_(vendor_ids)
+    ).group_by(model.vendor_id).all()
+    return dict(rows)
+
+
+def build_vendor_detail(vendor: Vendor, includes: List[str]) -> VendorDetailResponse:
+    """Serialize a vendor, touching only the relations that were eager-loaded"""
+    detail = VendorResponse.model_validate(vendor).model_dump()
+    for name in includes:
+        schema = VENDOR_INCLUDES[name]
+        value = getattr(vendor, name)
+        if isinstance(value, list):
+            detail[name] = [schema.model_validate(item) for item in value]
+        else:
+            detail[name] = schema.model_validate(value) if value is not None else None
+    return VendorDetailResponse(**detail)
+
+
 @router.post("/", response_model=VendorResponse)
-async def create_vendor(
+def create_vendor(
     vendor_data: VendorCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -57,7 +150,7 @@ async def create_vendor(
 
 
 @router.post("/public-registration", response_model=VendorResponse)
-async def create_vendor_public(
+def create_vendor_public(
     vendor_data: VendorCreate,
     request: Request,
     db: Session = Depends(get_db)
@@ -186,29 +279,21 @@ async def create_vendor_public(
     return db_vendor
 
 
-@router.get("/", response_model=List[VendorListResponse])
-async def get_vendors(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(25, ge=1, le=100),
+def apply_vendor_filters(
+    query,
+    db: Session,
     search: Optional[str] = None,
     status: Optional[VendorStatus] = None,
     vendor_type: Optional[VendorType] = None,
     msme_status: Optional[MSMEStatus] = None,
-    category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    category: Optional[str] = None
 ):
-    """Get list of vendors with filtering and pagination (public endpoint)"""
-    query = db.query(Vendor)
+    """Apply the vendor list filters to a query over vendors, returning it with its search ORDER BY clauses"""
+    search_order = []
     
     # Apply filters
     if search:
-        search_filter = or_(
-            Vendor.company_name.ilike(f"%{search}%"),
-            Vendor.contact_person_name.ilike(f"%{search}%"),
-            Vendor.email.ilike(f"%{search}%"),
-            Vendor.vendor_code.ilike(f"%{search}%")
-        )
-        query = query.filter(search_filter)
+        query, search_order = apply_vendor_search(query, db, search)
     
     if status:
         query = query.filter(Vendor.status == status)
@@ -222,48 +307,369 @@ async def get_vendors(
     if category:
         query = query.filter(Vendor.supplier_category == category)
     
-    # Apply pagination
-    vendors = query.offset(skip).limit(limit).all()
+    return query, search_order
+
+
+def export_response(export_format: str, query_factory, filename: str, on_complete):
+    """Response streaming an export query as csv, json (NDJSON) or excel
+
+    query_factory(include_id) builds the column query; on_complete(vendor_count, completed)
+    runs when the export ends, also when a streaming client disconnects part-way.
+    """
+    if export_format == "csv":
+        return StreamingResponse(
+            stream_csv(iter_export_rows(query_factory(False)), on_complete=on_complete),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
+        )
+    
+    if export_format == "json":
+        return StreamingResponse(
+            stream_ndjson(iter_export_records(query_factory(True)), on_complete=on_complete),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"Content-Disposition": f"attachment; filename={filename}.ndjson"}
+        )
+    
+    # Write-only workbook fed from a server-side cursor into a temp file
+    path = new_excel_tempfile()
+    try:
+        on_complete(write_excel(iter_export_rows(query_factory(False)), path))
+    except Exception:
+        os.remove(path)
+        raise
+    return FileResponse(
+        path,
+        media_type=EXCEL_MEDIA_TYPE,
+        filename=f"{filename}.xlsx",
+        background=BackgroundTask(os.remove, path)
+    )
+
+
+@router.get("/", response_model=List[VendorListResponse])
+def get_vendors(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque keyset cursor. Pass an empty value for the first page, then the "
+                    "X-Next-Cursor response header for each following page; skip is ignored."
+    ),
+    search: Optional[str] = None,
+    status: Optional[VendorStatus] = None,
+    vendor_type: Optional[VendorType] = None,
+    msme_status: Optional[MSMEStatus] = None,
+    category: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get list of vendors with filtering and pagination (public endpoint)"""
+    query, search_order = apply_vendor_filters(
+        db.query(Vendor), db, search, status, vendor_type, msme_status, category
+    )
+    
+    if cursor is None:
+        # Apply offset pagination, best search matches first
+        return query.order_by(*search_order, Vendor.id).offset(skip).limit(limit).all()
+    
+    # Cursor pages follow id order so that the seek position stays stable
+    query = query.order_by(Vendor.id)
+    
+    # Keyset pagination: seek past the last id of the previous page
+    if cursor:
+        try:
+            last_id = int(decode_cursor(cursor)["id"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(
+                status_code=400,  # "status" is shadowed by the filter parameter here
+                detail="Invalid pagination cursor"
+            )
+        query = query.filter(Vendor.id > last_id)
+    
+    # Fetch one extra row to know whether another page exists
+    vendors = query.limit(limit + 1).all()
+    if len(vendors) > limit:
+        vendors = vendors[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor({"id": vendors[-1].id})
     
     return vendors
 
 
-@router.get("/{vendor_id}", response_model=VendorResponse)
-async def get_vendor(
-    vendor_id: int,
+@router.get("/export")
+def export_vendors(
+    format: str = Query("csv", pattern="^(csv|json|excel)$", description="csv, json (newline-delimited) or excel"),
+    search: Optional[str] = None,
+    status: Optional[VendorStatus] = None,
+    vendor_type: Optional[VendorType] = None,
+    msme_status: Optional[MSMEStatus] = None,
+    category: Optional[str] = None,
     db: Session = Depends(get_db)
+    # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
 ):
-    """Get a specific vendor by ID (public endpoint)"""
-    vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
-    if not vendor:
+    """Export every vendor matching the GET /vendors filters, streamed straight from the query"""
+    # Temporarily use a default user ID for testing
+    current_user_id = 1
+    
+    filters = {
+        "search": search,
+        "status": status.value if status else None,
+        "vendor_type": vendor_type.value if vendor_type else None,
+        "msme_status": msme_status.value if msme_status else None,
+        "category": category
+    }
+    
+    def filtered_query(include_id: bool):
+        query, _ = apply_vendor_filters(
+            export_query(db, include_id=include_id), db, search, status, vendor_type, msme_status, category
+        )
+        return query
+    
+    def log_export(vendor_count: int, completed: bool = True):
+        compliance_logger.log_activity(
+            activity_type="VENDOR_FILTER_EXPORT",
+            user_id=current_user_id,
+            vendor_id=None,
+            details={
+                "export_format": format,
+                "vendor_count": vendor_count,
+                "completed": completed,
+                "filters": {key: value for key, value in filters.items() if value is not None}
+            }
+        )
+    
+    return export_response(
+        format, filtered_query, f"vendors-export-{datetime.now().strftime('%Y%m%d')}", log_export
+    )
+
+
+class ExportJobRequest(BaseModel):
+    format: str = Field("csv", pattern="^(csv|json|excel)$")
+    # Either explicit vendor IDs, or the GET /vendors filters (all vendors if none are given)
+    vendor_ids: Optional[List[int]] = None
+    search: Optional[str] = None
+    status: Optional[VendorStatus] = None
+    vendor_type: Optional[VendorType] = None
+    msme_status: Optional[MSMEStatus] = None
+    category: Optional[str] = None
+
+
+def export_job_response(job: dict, request: Request) -> dict:
+    """Public view of an export job"""
+    data = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "format": job["format"],
+        "rows_processed": job["rows_processed"],
+        "total_rows": job["total_rows"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "finished_at": job["finished_at"],
+        "download_url": (
+            str(request.url_for("download_export_job", job_id=job["job_id"])) if job["status"] == "completed" else None
+        )
+    }
+    if "cached" in job:
+        data["cached"] = job["cached"]
+    return data
+
+
+@router.post("/export-jobs", status_code=status.HTTP_202_ACCEPTED)
+def create_export_job(
+    export_request: ExportJobRequest,
+    request: Request
+    # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
+):
+    """Start a background export; poll the returned job and download the file when it completes"""
+    # Temporarily use a default user ID for testing
+    current_user_id = 1
+    
+    if export_request.vendor_ids is not None:
+        vendor_ids = sorted(set(export_request.vendor_ids))
+        params = {"vendor_ids": vendor_ids}
+        
+        def query_factory(db: Session, include_id: bool):
+            return export_query(db, vendor_ids, include_id=include_id)
+    else:
+        params = export_request.model_dump(exclude={"format", "vendor_ids"}, exclude_none=True, mode="json")
+        
+        def query_factory(db: Session, include_id: bool):
+            query, _ = apply_vendor_filters(
+                export_query(db, include_id=include_id), db, export_request.search, export_request.status,
+                export_request.vendor_type, export_request.msme_status, export_request.category
+            )
+            return query
+    
+    def log_export(vendor_count: int):
+        compliance_logger.log_activity(
+            activity_type="VENDOR_EXPORT_JOB",
+            user_id=current_user_id,
+            vendor_id=None,
+            details={
+                "export_format": export_request.format,
+                "vendor_count": vendor_count,
+                "params": params
+            }
+        )
+    
+    job = export_jobs.submit(export_request.format, params, query_factory, log_export)
+    if job["cached"]:
+        # log_export only runs for the job that produced the file; audit every request that reuses it
+        compliance_logger.log_activity(
+            activity_type="VENDOR_EXPORT_JOB",
+            user_id=current_user_id,
+            vendor_id=None,
+            details={
+                "export_format": export_request.format,
+                "job_id": job["job_id"],
+                "cached": True,
+                "params": params
+            }
+        )
+    return export_job_response(job, request)
+
+
+@router.get("/export-jobs/{job_id}")
+def get_export_job(job_id: str, request: Request):
+    """Get the status and progress of an export job"""
+    job = export_jobs.get(job_id)
+    if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Vendor not found"
+            detail="Export job not found"
+        )
+    return export_job_response(job, request)
+
+
+@router.get("/export-jobs/{job_id}/download")
+def download_export_job(job_id: str):
+    """Download the file produced by a completed export job"""
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job is {job['status']}"
+        )
+    path = export_jobs.artifact_path(job)
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Export file has expired"
+        )
+    
+    compliance_logger.log_activity(
+        activity_type="VENDOR_EXPORT_DOWNLOAD",
+        user_id=1,  # Temporarily use a default user ID for testing
+        vendor_id=None,
+        details={
+            "export_format": job["format"],
+            "job_id": job["job_id"],
+            "vendor_count": job["rows_processed"]
+        }
+    )
+    
+    media_types = {"csv": "text/csv", "json": NDJSON_MEDIA_TYPE, "excel": EXCEL_MEDIA_TYPE}
+    extension = os.path.splitext(path)[1]
+    return FileResponse(
+        path,
+        media_type=media_types[job["format"]],
+        filename=f"vendors-export-{job['created_at'][:10].replace('-', '')}{extension}"
+    )
+
+
+# Upper bound on IDs per batch request, keeping the IN list and response size sane
+VENDOR_BATCH_MAX_IDS = 500
+
+
+@router.get("/batch", response_model=VendorBatchResponse)
+def get_vendors_batch(
+    ids: str = Query(..., description=f"Comma-separated vendor IDs (max {VENDOR_BATCH_MAX_IDS})"),
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated related records to embed: " + ", ".join(VENDOR_INCLUDES)
+    ),
+    db: Session = Depends(get_db)
+):
+    """Get several vendors by ID in one request (public endpoint)"""
+    try:
+        vendor_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
         )
     
-    # Calculate counts for UI badges
-    from ..models.vendor_document import VendorDocument
-    from ..models.vendor import VendorCompliance, VendorAgreement
+    if not vendor_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one vendor ID is required"
+        )
+    
+    if len(vendor_ids) > VENDOR_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many IDs: {len(vendor_ids)} (max {VENDOR_BATCH_MAX_IDS})"
+        )
     
-    # Document count
-    document_count = db.query(VendorDocument).filter(VendorDocument.vendor_id == vendor_id).count()
+    includes = parse_vendor_includes(include)
     
-    # Compliance count (always 1 if vendor has compliance data)
-    compliance_count = db.query(VendorCompliance).filter(VendorCompliance.vendor_id == vendor_id).count()
+    query = db.query(Vendor).filter(Vendor.id.in_(vendor_ids))
+    for name in includes:
+        query = query.options(selectinload(getattr(Vendor, name)))
+    vendors = {vendor.id: vendor for vendor in query.all()}
     
-    # Agreement count (always 1 if vendor has agreement data)
-    agreement_count = db.query(VendorAgreement).filter(VendorAgreement.vendor_id == vendor_id).count()
+    found_ids = list(vendors)
+    document_counts = grouped_counts(db, VendorDocument, found_ids) if found_ids else {}
+    compliance_counts = grouped_counts(db, VendorCompliance, found_ids) if found_ids else {}
+    agreement_counts = grouped_counts(db, VendorAgreement, found_ids) if found_ids else {}
     
-    # Add counts to vendor object
-    vendor.document_count = document_count
-    vendor.compliance_count = compliance_count
-    vendor.agreement_count = agreement_count
+    results = {}
+    for vendor_id in vendor_ids:
+        vendor = vendors.get(vendor_id)
+        if vendor is None:
+            results[vendor_id] = {"found": False, "detail": "Vendor not found"}
+            continue
+        
+        vendor.document_count = document_counts.get(vendor_id, 0)
+        vendor.compliance_count = compliance_counts.get(vendor_id, 0)
+        vendor.agreement_count = agreement_counts.get(vendor_id, 0)
+        results[vendor_id] = {"found": True, "vendor": build_vendor_detail(vendor, includes)}
     
-    return vendor
+    return {
+        "vendors": results,
+        "found_count": len(vendors),
+        "not_found_count": len(vendor_ids) - len(vendors)
+    }
+
+
+@router.get("/{vendor_id}", response_model=VendorDetailResponse)
+def get_vendor(
+    vendor_id: int,
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated related records to embed: " + ", ".join(VENDOR_INCLUDES)
+    ),
+    db: Session = Depends(get_db)
+):
+    """Get a specific vendor by ID (public endpoint)"""
+    includes = parse_vendor_includes(include)
+    
+    vendor = load_vendor_detail(db, vendor_id, includes)
+    if not vendor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Vendor not found"
+        )
+    
+    return build_vendor_detail(vendor, includes)
 
 
 @router.put("/{vendor_id}", response_model=VendorResponse)
-async def update_vendor(
+def update_vendor(
     vendor_id: int,
     vendor_data: VendorUpdate,
     db: Session = Depends(get_db),
@@ -289,7 +695,7 @@ async def update_vendor(
 
 
 @router.delete("/{vendor_id}")
-async def delete_vendor(
+def delete_vendor(
     vendor_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -310,7 +716,7 @@ async def delete_vendor(
 
 # Vendor Address Routes
 @router.post("/{vendor_id}/addresses", response_model=VendorAddressResponse)
-async def create_vendor_address(
+def create_vendor_address(
     vendor_id: int,
     address_data: VendorAddressCreate,
     db: Session = Depends(get_db),
@@ -333,7 +739,7 @@ async def create_vendor_address(
 
 
 @router.get("/{vendor_id}/addresses", response_model=List[VendorAddressResponse])
-async def get_vendor_addresses(
+def get_vendor_addresses(
     vendor_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -351,7 +757,7 @@ async def get_vendor_addresses(
 
 # Vendor Bank Info Routes
 @router.post("/{vendor_id}/bank-info", response_model=VendorBankInfoResponse)
-async def create_vendor_bank_info(
+def create_vendor_bank_info(
     vendor_id: int,
     bank_data: VendorBankInfoCreate,
     db: Session = Depends(get_db),
@@ -385,7 +791,7 @@ async def create_vendor_bank_info(
 
 
 @router.get("/{vendor_id}/bank-info", response_model=VendorBankInfoResponse)
-async def get_vendor_bank_info(
+def get_vendor_bank_info(
     vendor_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -409,7 +815,7 @@ async def get_vendor_bank_info(
 
 # Vendor Compliance Routes
 @router.post("/{vendor_id}/compliance", response_model=VendorComplianceResponse)
-async def create_vendor_compliance(
+def create_vendor_compliance(
     vendor_id: int,
     compliance_data: VendorComplianceCreate,
     db: Session = Depends(get_db),
@@ -443,7 +849,7 @@ async def create_vendor_compliance(
 
 
 @router.get("/{vendor_id}/compliance", response_model=VendorComplianceResponse)
-async def get_vendor_compliance(
+def get_vendor_compliance(
     vendor_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -467,7 +873,7 @@ async def get_vendor_compliance(
 
 # Vendor Agreement Routes
 @router.post("/{vendor_id}/agreements", response_model=VendorAgreementResponse)
-async def create_vendor_agreements(
+def create_vendor_agreements(
     vendor_id: int,
     agreement_data: VendorAgreementCreate,
     db: Session = Depends(get_db),
@@ -501,7 +907,7 @@ async def create_vendor_agreements(
 
 
 @router.get("/{vendor_id}/agreements", response_model=VendorAgreementResponse)
-async def get_vendor_agreements(
+def get_vendor_agreements(
     vendor_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -525,7 +931,7 @@ async def get_vendor_agreements(
 
 # Vendor Compliance Certificate Routes
 @router.post("/{vendor_id}/compliance-certificates", response_model=VendorComplianceCertificateResponse)
-async def create_vendor_compliance_certificate(
+def create_vendor_compliance_certificate(
     vendor_id: int,
     certificate_data: VendorComplianceCertificateCreate,
     db: Session = Depends(get_db)
@@ -572,7 +978,7 @@ async def create_vendor_compliance_certificate(
 
 
 @router.get("/{vendor_id}/compliance-certificates", response_model=List[VendorComplianceCertificateResponse])
-async def get_vendor_compliance_certificates(
+def get_vendor_compliance_certificates(
     vendor_id: int,
     db: Session = Depends(get_db)
 ):
@@ -588,7 +994,7 @@ async def get_vendor_compliance_certificates(
 
 
 @router.put("/{vendor_id}/compliance-certificates/{certificate_id}", response_model=VendorComplianceCertificateResponse)
-async def update_vendor_compliance_certificate(
+def update_vendor_compliance_certificate(
     vendor_id: int,
     certificate_id: int,
     certificate_data: VendorComplianceCertificateUpdate,
@@ -626,7 +1032,7 @@ async def update_vendor_compliance_certificate(
 
 
 @router.delete("/{vendor_id}/compliance-certificates/{certificate_id}")
-async def delete_vendor_compliance_certificate(
+def delete_vendor_compliance_certificate(
     vendor_id: int,
     certificate_id: int,
     db: Session = Depends(get_db),
@@ -659,7 +1065,7 @@ async def delete_vendor_compliance_certificate(
 
 # Vendor Agreement Detail Endpoints
 @router.post("/{vendor_id}/agreement-details", response_model=VendorAgreementDetailResponse)
-async def create_vendor_agreement_detail(
+def create_vendor_agreement_detail(
     vendor_id: int,
     agreement_data: VendorAgreementDetailCreate,
     db: Session = Depends(get_db)
@@ -681,7 +1087,7 @@ async def create_vendor_agreement_detail(
 
 
 @router.get("/{vendor_id}/agreement-details", response_model=List[VendorAgreementDetailResponse])
-async def get_vendor_agreement_details(
+def get_vendor_agreement_details(
     vendor_id: int,
     db: Session = Depends(get_db)
 ):
@@ -701,7 +1107,7 @@ async def get_vendor_agreement_details(
 
 
 @router.put("/{vendor_id}/agreement-details/{agreement_id}", response_model=VendorAgreementDetailResponse)
-async def update_vendor_agreement_detail(
+def update_vendor_agreement_detail(
     vendor_id: int,
     agreement_id: int,
     agreement_data: VendorAgreementDetailUpdate,
@@ -739,7 +1145,7 @@ async def update_vendor_agreement_detail(
 
 
 @router.delete("/{vendor_id}/agreement-details/{agreement_id}")
-async def delete_vendor_agreement_detail(
+def delete_vendor_agreement_detail(
     vendor_id: int,
     agreement_id: int,
     db: Session = Depends(get_db),
@@ -771,7 +1177,7 @@ async def delete_vendor_agreement_detail(
 
 
 @router.get("/{vendor_id}/agreement-details/{agreement_id}/view")
-async def view_agreement_document(
+def view_agreement_document(
     vendor_id: int,
     agreement_id: int,
     db: Session = Depends(get_db)
@@ -816,7 +1222,7 @@ async def view_agreement_document(
 
 
 @router.get("/{vendor_id}/agreement-details/{agreement_id}/pdf")
-async def download_agreement_pdf(
+def download_agreement_pdf(
     vendor_id: int,
     agreement_id: int,
     db: Session = Depends(get_db)
@@ -1017,7 +1423,7 @@ async def download_agreement_pdf(
 
 
 @router.get("/{vendor_id}/agreement-details/{agreement_id}/signature")
-async def view_agreement_signature(
+def view_agreement_signature(
     vendor_id: int,
     agreement_id: int,
     db: Session = Depends(get_db)
@@ -1071,7 +1477,7 @@ async def view_agreement_signature(
 
 
 @router.get("/{vendor_id}/agreement-details/{agreement_id}/signature-image")
-async def get_signature_image(
+def get_signature_image(
     vendor_id: int,
     agreement_id: int,
     db: Session = Depends(get_db)
@@ -1108,7 +1514,7 @@ async def get_signature_image(
 
 
 @router.post("/{vendor_id}/agreement-details/{agreement_id}/comments")
-async def add_agreement_comment(
+def add_agreement_comment(
     vendor_id: int,
     agreement_id: int,
     comment_data: dict,
@@ -1161,7 +1567,7 @@ async def add_agreement_comment(
 
 
 @router.get("/{vendor_id}/agreement-details/{agreement_id}/comments")
-async def get_agreement_comments(
+def get_agreement_comments(
     vendor_id: int,
     agreement_id: int,
     db: Session = Depends(get_db)
@@ -1218,7 +1624,7 @@ async def get_agreement_comments(
 
 
 @router.get("/{vendor_id}/export/pdf")
-async def export_vendor_pdf(
+def export_vendor_pdf(
     vendor_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -1555,17 +1961,16 @@ async def export_vendor_pdf(
 
 
 @router.get("/{vendor_id}/export/excel")
-async def export_vendor_excel(
+def export_vendor_excel(
     vendor_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export vendor data as Excel"""
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
     from openpyxl.utils import get_column_letter
-    from io import BytesIO
-    from fastapi.responses import StreamingResponse
     
     # Get vendor data
     vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
@@ -1575,14 +1980,11 @@ async def export_vendor_excel(
             detail="Vendor not found"
         )
     
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Vendor Profile"
-    
     # Styles
     header_font = Font(bold=True, color="FFFFFF")
     header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    section_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+    footer_font = Font(size=10, color="808080")
     border = Border(
         left=Side(style='thin'),
         right=Side(style='thin'),
@@ -1590,144 +1992,105 @@ async def export_vendor_excel(
         bottom=Side(style='thin')
     )
     
-    # Title
-    ws.merge_cells('A1:B1')
-    ws['A1'] = f"Vendor Profile Report - {vendor.company_name}"
-    ws['A1'].font = Font(bold=True, size=16)
-    ws['A1'].alignment = Alignment(horizontal='center')
-    
-    # Basic Information
-    ws['A3'] = "Basic Information"
-    ws['A3'].font = Font(bold=True, size=14)
-    ws['A3'].fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-    
-    basic_data = [
-        ['Vendor Code', vendor.vendor_code],
-        ['Company Name', vendor.company_name],
-        ['Legal Name', vendor.legal_name or 'N/A'],
-        ['Status', vendor.status],
-        ['Email', vendor.email],
-        ['Phone', vendor.phone],
-        ['Registration Date', vendor.registration_date.strftime('%d/%m/%Y') if vendor.registration_date else 'N/A'],
+    sections = [
+        ("Basic Information", [
+            ['Vendor Code', vendor.vendor_code],
+            ['Company Name', vendor.company_name],
+            ['Status', vendor.status.value if vendor.status else 'N/A'],
+            ['Email', vendor.email],
+            ['Phone', vendor.phone_number],
+            ['Registration Date', vendor.created_at.strftime('%d/%m/%Y') if vendor.created_at else 'N/A'],
+        ]),
+        ("Business Information", [
+            ['Category', vendor.supplier_category or 'N/A'],
+            ['Business Type', vendor.supplier_type.value if vendor.supplier_type else 'N/A'],
+            ['Industry', vendor.industry_sector or 'N/A'],
+            ['Year Established', str(vendor.year_established) if vendor.year_established else 'N/A'],
+            ['Employee Count', vendor.employee_count or 'N/A'],
+            ['Annual Turnover', vendor.annual_turnover or 'N/A'],
+        ]),
+        ("Compliance Information", [
+            ['PAN Number', vendor.pan_number or 'N/A'],
+            ['GST Number', vendor.gst_number or 'N/A'],
+            ['Registration Number', vendor.registration_number or 'N/A'],
+            ['MSME Number', vendor.msme_number or 'N/A'],
+            ['Tax Registration Number', vendor.tax_registration_number or 'N/A'],
+        ]),
+        ("Address Information", [
+            ['City', vendor.registered_city],
+            ['State', vendor.registered_state],
+            ['Country', vendor.registered_country],
+            ['Postal Code', vendor.registered_pincode],
+            ['Registered Address', vendor.registered_address or 'N/A'],
+        ]),
     ]
     
-    for i, (key, value) in enumerate(basic_data, start=4):
-        ws[f'A{i}'] = key
-        ws[f'B{i}'] = value
-        ws[f'A{i}'].font = Font(bold=True)
-        ws[f'A{i}'].fill = header_fill
-        ws[f'A{i}'].font = header_font
-        ws[f'A{i}'].border = border
-        ws[f'B{i}'].border = border
+    # Write-only workbook: rows are appended in order and column widths
+    # must be set up front, estimated from the field rows
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Vendor Profile")
+    for index, width in enumerate(estimate_column_widths([row for _, rows in sections for row in rows]), 1):
+        ws.column_dimensions[get_column_letter(index)].width = width
     
-    # Business Information
-    ws['A12'] = "Business Information"
-    ws['A12'].font = Font(bold=True, size=14)
-    ws['A12'].fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-    
-    business_data = [
-        ['Category', vendor.category],
-        ['Business Type', vendor.business_type],
-        ['Industry', vendor.industry],
-        ['Year Established', str(vendor.year_established) if vendor.year_established else 'N/A'],
-        ['Employee Count', vendor.employee_count or 'N/A'],
-        ['Annual Revenue', vendor.annual_revenue or 'N/A'],
-    ]
-    
-    for i, (key, value) in enumerate(business_data, start=13):
-        ws[f'A{i}'] = key
-        ws[f'B{i}'] = value
-        ws[f'A{i}'].font = Font(bold=True)
-        ws[f'A{i}'].fill = header_fill
-        ws[f'A{i}'].font = header_font
-        ws[f'A{i}'].border = border
-        ws[f'B{i}'].border = border
+    def styled(value, **styles):
+        cell = WriteOnlyCell(ws, value=value)
+        for name, style in styles.items():
+            setattr(cell, name, style)
+        return cell
     
-    # Compliance Information
-    ws['A20'] = "Compliance Information"
-    ws['A20'].font = Font(bold=True, size=14)
-    ws['A20'].fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-    
-    compliance_data = [
-        ['PAN Number', vendor.pan_number or 'N/A'],
-        ['GST Number', vendor.gst_number or 'N/A'],
-        ['CIN Number', vendor.cin_number or 'N/A'],
-        ['MSME Number', vendor.msme_number or 'N/A'],
-        ['Nature of Assessee', vendor.nature_of_assessee or 'N/A'],
-    ]
-    
-    for i, (key, value) in enumerate(compliance_data, start=21):
-        ws[f'A{i}'] = key
-        ws[f'B{i}'] = value
-        ws[f'A{i}'].font = Font(bold=True)
-        ws[f'A{i}'].fill = header_fill
-        ws[f'A{i}'].font = header_font
-        ws[f'A{i}'].border = border
-        ws[f'B{i}'].border = border
-    
-    # Address Information
-    ws['A27'] = "Address Information"
-    ws['A27'].font = Font(bold=True, size=14)
-    ws['A27'].fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-    
-    address_data = [
-        ['City', vendor.city],
-        ['State', vendor.state],
-        ['Country', vendor.country],
-        ['Postal Code', vendor.postal_code],
-        ['Registered Address', vendor.registered_address or 'N/A'],
-    ]
-    
-    for i, (key, value) in enumerate(address_data, start=28):
-        ws[f'A{i}'] = key
-        ws[f'B{i}'] = value
-        ws[f'A{i}'].font = Font(bold=True)
-        ws[f'A{i}'].fill = header_fill
-        ws[f'A{i}'].font = header_font
-        ws[f'A{i}'].border = border
-        ws[f'B{i}'].border = border
+    # Title
+    ws.append([styled(f"Vendor Profile Report - {vendor.company_name}",
+                      font=Font(bold=True, size=16), alignment=Alignment(horizontal='center'))])
+    
+    for title, rows in sections:
+        ws.append([])
+        ws.append([styled(title, font=Font(bold=True, size=14), fill=section_fill)])
+        for key, value in rows:
+            ws.append([
+                styled(key, font=header_font, fill=header_fill, border=border),
+                styled(value, border=border)
+            ])
     
     # Footer
-    ws[f'A35'] = f"Generated on: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-    ws[f'A36'] = f"Generated by: {current_user.email}"
-    ws['A35'].font = Font(size=10, color="808080")
-    ws['A36'].font = Font(size=10, color="808080")
-    
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
-    # Save to buffer
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
+    ws.append([])
+    ws.append([styled(f"Generated on: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", font=footer_font)])
+    ws.append([styled(f"Generated by: {current_user.email}", font=footer_font)])
+    
+    path = new_excel_tempfile()
+    try:
+        wb.save(path)
+    except Exception:
+        os.remove(path)
+        raise
     
-    # Return Excel file as streaming response
+    # Return Excel file, streamed from disk and removed afterwards
     filename = f"vendor_{vendor.vendor_code}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
     
-    return StreamingResponse(
-        iter([buffer.getvalue()]),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    ) 
+    return FileResponse(
+        path,
+        media_type=EXCEL_MEDIA_TYPE,
+        filename=filename,
+        background=BackgroundTask(os.remove, path)
+    )
 
 
 # Bulk Operations
-from pydantic import BaseModel
 from typing import List
 import csv
 import json
 from fastapi import UploadFile, File, Form
 
+# Largest id list sent in a single bulk statement, well under the bind
+# parameter limits of SQLite and PostgreSQL
+VENDOR_BULK_CHUNK_SIZE = 5000
+
+
+def id_chunks(ids: List[int], size: int = VENDOR_BULK_CHUNK_SIZE):
+    """Split an id list into consecutive chunks of at most size ids"""
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
 class BulkStatusUpdate(BaseModel):
     vendor_ids: List[int]
     status: VendorStatus
@@ -1736,55 +2099,78 @@ class BulkStatusUpdate(BaseModel):
 class BulkDeleteRequest(BaseModel):
     vendor_ids: List[int]
     reason: Optional[str] = None
+    chunk_size: Optional[int] = Field(None, ge=1, le=VENDOR_BULK_CHUNK_SIZE)  # defaults to settings.bulk_delete_chunk_size
 
 class BulkExportRequest(BaseModel):
     vendor_ids: List[int]
     format: str  # 'csv', 'excel', 'json'
 
 @router.post("/bulk/status-update")
-async def bulk_update_vendor_status(
+def bulk_update_vendor_status(
     request: BulkStatusUpdate,
     db: Session = Depends(get_db)
     # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
 ):
-    """Bulk update vendor status"""
+    """Bulk update vendor status with set-based UPDATE statements"""
     try:
         # Temporarily use a default user ID for testing
         current_user_id = 1
         
-        updated_count = 0
-        failed_vendors = []
+        requested_ids = list(dict.fromkeys(request.vendor_ids))
+        updated_at = datetime.utcnow()
+        old_statuses = {}
         
-        for vendor_id in request.vendor_ids:
-            vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
-            if vendor:
-                try:
-                    vendor.status = request.status
-                    vendor.updated_at = datetime.utcnow()
-                    updated_count += 1
-                    
-                    # Log the status update
-                    compliance_logger.log_activity(
-                        activity_type="BULK_STATUS_UPDATE",
-                        user_id=current_user_id,
-                        vendor_id=vendor_id,
-                        details={
-                            "old_status": vendor.status.value if vendor.status else "unknown",
-                            "new_status": request.status.value,
-                            "reason": request.reason,
-                            "bulk_operation": True
-                        }
-                    )
-                except Exception as e:
-                    failed_vendors.append({"vendor_id": vendor_id, "error": str(e)})
+        for chunk in id_chunks(requested_ids):
+            if db.get_bind().dialect.name == "postgresql":
+                # Lock the rows and report their pre-update status in one statement
+                old = select(Vendor.id, Vendor.status).where(Vendor.id.in_(chunk)).with_for_update().subquery("old")
+                rows = db.execute(
+                    update(Vendor)
+                    .where(Vendor.id == old.c.id)
+                    .values(status=request.status, updated_at=updated_at)
+                    .returning(Vendor.id, old.c.status)
+                    .execution_options(synchronize_session=False)
+                ).all()
             else:
-                failed_vendors.append({"vendor_id": vendor_id, "error": "Vendor not found"})
+                # SQLite's RETURNING cannot see the joined pre-update row; its
+                # writes are serialized, so read then update
+                rows = db.execute(
+                    select(Vendor.id, Vendor.status).where(Vendor.id.in_(chunk)).with_for_update()
+                ).all()
+                if rows:
+                    db.execute(
+                        update(Vendor)
+                        .where(Vendor.id.in_([vendor_id for vendor_id, _ in rows]))
+                        .values(status=request.status, updated_at=updated_at)
+                        .execution_options(synchronize_session=False)
+                    )
+            old_statuses.update(rows)
+        
+        failed_vendors = [
+            {"vendor_id": vendor_id, "error": "Vendor not found"}
+            for vendor_id in requested_ids if vendor_id not in old_statuses
+        ]
         
         db.commit()
         
+        if old_statuses:
+            compliance_logger.log_bulk_activity(
+                activity_type="BULK_STATUS_UPDATE",
+                user_id=current_user_id,
+                entries=[
+                    {"vendor_id": vendor_id, "old_status": old_status.value if old_status else "unknown"}
+                    for vendor_id, old_status in old_statuses.items()
+                ],
+                details={
+                    "new_status": request.status.value,
+                    "reason": request.reason,
+                    "bulk_operation": True
+                }
+            )
+        
         return {
-            "message": f"Successfully updated {updated_count} vendors",
-            "updated_count": updated_count,
+            "message": f"Successfully updated {len(old_statuses)} vendors",
+            "updated_count": len(old_statuses),
             "failed_count": len(failed_vendors),
             "failed_vendors": failed_vendors
         }
@@ -1797,51 +2183,125 @@ async def bulk_update_vendor_status(
         )
 
 
+# Child tables removed together with their vendor (every cascading relationship)
+VENDOR_CASCADE_MODELS = [
+    relationship.mapper.class_
+    for relationship in Vendor.__mapper__.relationships
+    if relationship.cascade.delete
+]
+
+
+# Columns holding stored files (blob URLs or local paths) of a vendor and its child records
+VENDOR_FILE_COLUMNS = [
+    (Vendor.incorporation_certificate_path, Vendor.id),
+    (VendorDocument.file_path, VendorDocument.vendor_id),
+    (VendorAgreementDetail.agreement_document_path, VendorAgreementDetail.vendor_id),
+    (VendorAgreementDetail.signed_document_path, VendorAgreementDetail.vendor_id),
+    (VendorComplianceCertificate.certificate_document_path, VendorComplianceCertificate.vendor_id),
+    (VendorComplianceCertificate.audit_report_path, VendorComplianceCertificate.vendor_id),
+]
+
+
+def vendor_file_paths(db: Session, vendor_ids: List[int]) -> List[str]:
+    """Every stored file referenced by the vendors or their child records"""
+    return db.execute(union_all(*(
+        select(column).where(owner.in_(vendor_ids), column.isnot(None), column != "")
+        for column, owner in VENDOR_FILE_COLUMNS
+    ))).scalars().all()
+
+
+def delete_vendor_files(file_paths: List[str]):
+    """Remove stored files of deleted vendors (runs after the response)"""
+    for file_path in file_paths:
+        try:
+            azure_storage.delete_file(file_path)
+        except Exception as e:
+            compliance_logger.error_logger.error("File cleanup failed", extra={"event": {
+                "event_type": "FILE_CLEANUP_FAILED",
+                "timestamp": datetime.utcnow().isoformat(),
+                "file_path": file_path,
+                "error_type": type(e).__name__,
+                "error_message": str(e)
+            }})
+
+
 @router.post("/bulk/delete")
-async def bulk_delete_vendors(
+def bulk_delete_vendors(
     request: BulkDeleteRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
     # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
 ):
-    """Bulk delete vendors"""
+    """Bulk delete vendors and their related records with set-based DELETEs, one transaction per chunk"""
     try:
         # Temporarily use a default user ID for testing
         current_user_id = 1
         
-        deleted_count = 0
+        requested_ids = list(dict.fromkeys(request.vendor_ids))
+        chunk_size = request.chunk_size or settings.bulk_delete_chunk_size
+        deleted_ids = set()
         failed_vendors = []
+        queued_files = 0
         
-        for vendor_id in request.vendor_ids:
-            vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
-            if vendor:
-                try:
-                    # Log the deletion before actually deleting
-                    compliance_logger.log_activity(
-                        activity_type="BULK_VENDOR_DELETE",
-                        user_id=current_user_id,
-                        vendor_id=vendor_id,
-                        details={
-                            "vendor_code": vendor.vendor_code,
-                            "company_name": vendor.company_name,
-                            "reason": request.reason,
-                            "bulk_operation": True
-                        }
+        for chunk in id_chunks(requested_ids, chunk_size):
+            try:
+                vendors = db.execute(
+                    select(Vendor.id, Vendor.vendor_code, Vendor.company_name).where(Vendor.id.in_(chunk))
+                ).all()
+                if not vendors:
+                    continue
+                vendor_ids = [vendor.id for vendor in vendors]
+                file_paths = vendor_file_paths(db, vendor_ids)
+                
+                for model in VENDOR_CASCADE_MODELS:
+                    db.execute(
+                        delete(model)
+                        .where(model.vendor_id.in_(vendor_ids))
+                        .execution_options(synchronize_session=False)
                     )
-                    
-                    db.delete(vendor)
-                    deleted_count += 1
-                except Exception as e:
-                    failed_vendors.append({"vendor_id": vendor_id, "error": str(e)})
-            else:
-                failed_vendors.append({"vendor_id": vendor_id, "error": "Vendor not found"})
+                db.execute(
+                    delete(Vendor)
+                    .where(Vendor.id.in_(vendor_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                failed_vendors.extend({"vendor_id": vendor_id, "error": str(e)} for vendor_id in chunk)
+                continue
+            
+            deleted_ids.update(vendor_ids)
+            compliance_logger.log_bulk_activity(
+                activity_type="BULK_VENDOR_DELETE",
+                user_id=current_user_id,
+                entries=[
+                    {"vendor_id": vendor.id, "vendor_code": vendor.vendor_code, "company_name": vendor.company_name}
+                    for vendor in vendors
+                ],
+                details={
+                    "reason": request.reason,
+                    "bulk_operation": True
+                }
+            )
+            
+            # Blob deletion is slow and non-transactional: do it after the response
+            if file_paths:
+                background_tasks.add_task(delete_vendor_files, file_paths)
+                queued_files += len(file_paths)
         
-        db.commit()
+        failed_ids = {failure["vendor_id"] for failure in failed_vendors}
+        failed_vendors.extend(
+            {"vendor_id": vendor_id, "error": "Vendor not found"}
+            for vendor_id in requested_ids
+            if vendor_id not in deleted_ids and vendor_id not in failed_ids
+        )
         
         return {
-            "message": f"Successfully deleted {deleted_count} vendors",
-            "deleted_count": deleted_count,
+            "message": f"Successfully deleted {len(deleted_ids)} vendors",
+            "deleted_count": len(deleted_ids),
             "failed_count": len(failed_vendors),
-            "failed_vendors": failed_vendors
+            "failed_vendors": failed_vendors,
+            "queued_file_deletions": queued_files
         }
         
     except Exception as e:
@@ -1853,7 +2313,7 @@ async def bulk_delete_vendors(
 
 
 @router.post("/bulk/export")
-async def bulk_export_vendors(
+def bulk_export_vendors(
     request: BulkExportRequest,
     db: Session = Depends(get_db)
     # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
@@ -1863,8 +2323,11 @@ async def bulk_export_vendors(
         # Temporarily use a default user ID for testing
         current_user_id = 1
         
-        # Get vendors
-        vendors = db.query(Vendor).filter(Vendor.id.in_(request.vendor_ids)).all()
+        # CSV and Excel stream their rows; JSON still loads the vendors up front
+        if request.format.lower() in ('csv', 'excel'):
+            vendors = db.query(Vendor.id).filter(Vendor.id.in_(request.vendor_ids)).limit(1).all()
+        else:
+            vendors = db.query(Vendor).filter(Vendor.id.in_(request.vendor_ids)).all()
         
         if not vendors:
             raise HTTPException(
@@ -1915,159 +2378,28 @@ async def bulk_export_vendors(
                 "count": len(vendors)
             }
             
-        elif request.format.lower() == 'csv':
-            # Export as CSV
-            import io
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write headers
-            headers = [
-                "Vendor Code", "Company Name", "Contact Person", "Email", "Phone",
-                "Status", "Supplier Type", "Country", "Category", "MSME Status",
-                "Registration Number", "PAN Number", "GST Number", "Annual Turnover",
-                "Employee Count", "Business Vertical", "Created Date"
-            ]
-            writer.writerow(headers)
-            
-            # Write data
-            for vendor in vendors:
-                row = [
-                    vendor.vendor_code,
-                    vendor.company_name,
-                    vendor.contact_person_name,
-                    vendor.email,
-                    vendor.phone_number,
-                    vendor.status.value if vendor.status else "",
-                    vendor.supplier_type.value if vendor.supplier_type else "",
-                    vendor.country_origin,
-                    vendor.supplier_category,
-                    vendor.msme_status.value if vendor.msme_status else "",
-                    vendor.registration_number,
-                    vendor.pan_number,
-                    vendor.gst_number,
-                    vendor.annual_turnover,
-                    vendor.employee_count,
-                    vendor.business_vertical,
-                    vendor.created_at.strftime("%Y-%m-%d %H:%M:%S") if vendor.created_at else ""
-                ]
-                writer.writerow(row)
-            
-            csv_content = output.getvalue()
-            output.close()
+        elif request.format.lower() in ('csv', 'excel'):
+            # Stream rows in batches straight from a server-side cursor
+            export_format = request.format.lower()
             
-            # Log export activity
-            compliance_logger.log_activity(
-                activity_type="BULK_VENDOR_EXPORT",
-                user_id=current_user_id,
-                vendor_id=None,
-                details={
-                    "export_format": "csv",
-                    "vendor_count": len(vendors),
-                    "vendor_ids": request.vendor_ids
-                }
-            )
-            
-            return Response(
-                content=csv_content,
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename=vendors-bulk-export-{datetime.now().strftime('%Y%m%d')}.csv"
-                }
-            )
-            
-        elif request.format.lower() == 'excel':
-            # Export as Excel
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment
-            import io
-            
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Vendors Export"
-            
-            # Define headers
-            headers = [
-                "Vendor Code", "Company Name", "Contact Person", "Email", "Phone",
-                "Status", "Supplier Type", "Country", "Category", "MSME Status",
-                "Registration Number", "PAN Number", "GST Number", "Annual Turnover",
-                "Employee Count", "Business Vertical", "Created Date"
-            ]
-            
-            # Style for headers
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Add headers
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = header_alignment
-            
-            # Add vendor data
-            for row, vendor in enumerate(vendors, 2):
-                vendor_data = [
-                    vendor.vendor_code,
-                    vendor.company_name,
-                    vendor.contact_person_name,
-                    vendor.email,
-                    vendor.phone_number,
-                    vendor.status.value if vendor.status else "",
-                    vendor.supplier_type.value if vendor.supplier_type else "",
-                    vendor.country_origin,
-                    vendor.supplier_category,
-                    vendor.msme_status.value if vendor.msme_status else "",
-                    vendor.registration_number,
-                    vendor.pan_number,
-                    vendor.gst_number,
-                    vendor.annual_turnover,
-                    vendor.employee_count,
-                    vendor.business_vertical,
-                    vendor.created_at.strftime("%Y-%m-%d %H:%M:%S") if vendor.created_at else ""
-                ]
-                
-                for col, value in enumerate(vendor_data, 1):
-                    ws.cell(row=row, column=col, value=value)
-            
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Save to bytes
-            excel_file = io.BytesIO()
-            wb.save(excel_file)
-            excel_file.seek(0)
-            
-            # Log export activity
-            compliance_logger.log_activity(
-                activity_type="BULK_VENDOR_EXPORT",
-                user_id=current_user_id,
-                vendor_id=None,
-                details={
-                    "export_format": "excel",
-                    "vendor_count": len(vendors),
-                    "vendor_ids": request.vendor_ids
-                }
-            )
+            def log_bulk_export(vendor_count: int, completed: bool = True):
+                compliance_logger.log_activity(
+                    activity_type="BULK_VENDOR_EXPORT",
+                    user_id=current_user_id,
+                    vendor_id=None,
+                    details={
+                        "export_format": export_format,
+                        "vendor_count": vendor_count,
+                        "completed": completed,
+                        "vendor_ids": request.vendor_ids
+                    }
+                )
             
-            return Response(
-                content=excel_file.getvalue(),
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={
-                    "Content-Disposition": f"attachment; filename=vendors-bulk-export-{datetime.now().strftime('%Y%m%d')}.xlsx"
-                }
+            return export_response(
+                export_format,
+                lambda include_id: export_query(db, request.vendor_ids, include_id=include_id),
+                f"vendors-bulk-export-{datetime.now().strftime('%Y%m%d')}",
+                log_bulk_export
             )
         
         else:
@@ -2083,8 +2415,30 @@ async def bulk_export_vendors(
         )
 
 
+# Rejected rows copied into the audit record of a synchronous import
+IMPORT_LOG_FAILED_ROWS = 100
+
+
+def bulk_import_format(file: UploadFile) -> str:
+    """File extension of an import upload, rejecting missing or unsupported files"""
+    if not file.filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No file provided"
+        )
+    
+    file_extension = file.filename.split('.')[-1].lower()
+    
+    if file_extension not in ['csv', 'xlsx', 'xls']:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported file format. Please upload CSV or Excel file"
+        )
+    return file_extension
+
+
 @router.post("/bulk/import")
-async def bulk_import_vendors(
+def bulk_import_vendors(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
     # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
@@ -2094,143 +2448,22 @@ async def bulk_import_vendors(
         # Temporarily use a default user ID for testing
         current_user_id = 1
         
-        if not file.filename:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No file provided"
-            )
-        
-        file_extension = file.filename.split('.')[-1].lower()
-        
-        if file_extension not in ['csv', 'xlsx', 'xls']:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unsupported file format. Please upload CSV or Excel file"
-            )
-        
-        # Read file content
-        content = await file.read()
-        
-        imported_count = 0
-        failed_rows = []
+        file_extension = bulk_import_format(file)
         
         if file_extension == 'csv':
-            # Process CSV
-            import io
-            csv_content = content.decode('utf-8')
-            csv_file = io.StringIO(csv_content)
-            reader = csv.DictReader(csv_file)
-            
-            for row_num, row in enumerate(reader, 2):  # Start from 2 to account for header
-                try:
-                    # Create vendor from CSV row
-                    vendor_data = {
-                        "company_name": row.get("Company Name", ""),
-                        "contact_person_name": row.get("Contact Person", ""),
-                        "email": row.get("Email", ""),
-                        "phone_number": row.get("Phone", ""),
-                        "supplier_type": row.get("Supplier Type", "domestic"),
-                        "country_origin": row.get("Country", "IN"),
-                        "supplier_category": row.get("Category", ""),
-                        "registration_number": row.get("Registration Number", ""),
-                        "pan_number": row.get("PAN Number", ""),
-                        "gst_number": row.get("GST Number", ""),
-                        "annual_turnover": int(row.get("Annual Turnover", 0)) if row.get("Annual Turnover") else None,
-                        "employee_count": int(row.get("Employee Count", 0)) if row.get("Employee Count") else None,
-                        "business_vertical": row.get("Business Vertical", ""),
-                        "status": "pending"
-                    }
-                    
-                    # Check if vendor with same email already exists
-                    existing_vendor = db.query(Vendor).filter(Vendor.email == vendor_data["email"]).first()
-                    if existing_vendor:
-                        failed_rows.append({
-                            "row": row_num,
-                            "error": f"Vendor with email {vendor_data['email']} already exists"
-                        })
-                        continue
-                    
-                    # Create vendor
-                    vendor_code = generate_vendor_code()
-                    db_vendor = Vendor(
-                        vendor_code=vendor_code,
-                        **vendor_data
-                    )
-                    
-                    db.add(db_vendor)
-                    imported_count += 1
-                    
-                except Exception as e:
-                    failed_rows.append({
-                        "row": row_num,
-                        "error": str(e)
-                    })
+            # Parse the spooled upload incrementally instead of reading it whole
+            rows = iter_csv_rows(file.file)
         
         elif file_extension in ['xlsx', 'xls']:
-            # Process Excel
-            import io
-            from openpyxl import load_workbook
-            
-            excel_file = io.BytesIO(content)
-            wb = load_workbook(excel_file)
-            ws = wb.active
-            
-            # Get headers from first row
-            headers = [cell.value for cell in ws[1]]
-            
-            for row_num in range(2, ws.max_row + 1):
-                try:
-                    row_data = {}
-                    for col, header in enumerate(headers, 1):
-                        cell_value = ws.cell(row=row_num, column=col).value
-                        row_data[header] = str(cell_value) if cell_value is not None else ""
-                    
-                    # Create vendor from Excel row
-                    vendor_data = {
-                        "company_name": row_data.get("Company Name", ""),
-                        "contact_person_name": row_data.get("Contact Person", ""),
-                        "email": row_data.get("Email", ""),
-                        "phone_number": row_data.get("Phone", ""),
-                        "supplier_type": row_data.get("Supplier Type", "domestic"),
-                        "country_origin": row_data.get("Country", "IN"),
-                        "supplier_category": row_data.get("Category", ""),
-                        "registration_number": row_data.get("Registration Number", ""),
-                        "pan_number": row_data.get("PAN Number", ""),
-                        "gst_number": row_data.get("GST Number", ""),
-                        "annual_turnover": int(row_data.get("Annual Turnover", 0)) if row_data.get("Annual Turnover") else None,
-                        "employee_count": int(row_data.get("Employee Count", 0)) if row_data.get("Employee Count") else None,
-                        "business_vertical": row_data.get("Business Vertical", ""),
-                        "status": "pending"
-                    }
-                    
-                    # Check if vendor with same email already exists
-                    existing_vendor = db.query(Vendor).filter(Vendor.email == vendor_data["email"]).first()
-                    if existing_vendor:
-                        failed_rows.append({
-                            "row": row_num,
-                            "error": f"Vendor with email {vendor_data['email']} already exists"
-                        })
-                        continue
-                    
-                    # Create vendor
-                    vendor_code = generate_vendor_code()
-                    db_vendor = Vendor(
-                        vendor_code=vendor_code,
-                        **vendor_data
-                    )
-                    
-                    db.add(db_vendor)
-                    imported_count += 1
-                    
-                except Exception as e:
-                    failed_rows.append({
-                        "row": row_num,
-                        "error": str(e)
-                    })
+            # Stream the sheet in read-only mode through the same chunked path
+            rows = iter_excel_rows(file.file)
+        
+        # Validate, de-duplicate against existing emails and insert chunk by chunk
+        imported_count, failed_rows = import_vendor_rows(db, rows, generate_vendor_code)
         
         db.commit()
         
-        # Log import activity
+        # Log import activity (rejections beyond the first few stay in the response only)
         compliance_logger.log_activity(
             activity_type="BULK_VENDOR_IMPORT",
             user_id=current_user_id,
@@ -2239,7 +2472,7 @@ async def bulk_import_vendors(
                 "file_name": file.filename,
                 "imported_count": imported_count,
                 "failed_count": len(failed_rows),
-                "failed_rows": failed_rows
+                "failed_rows": failed_rows[:IMPORT_LOG_FAILED_ROWS]
             }
         )
         
@@ -2255,4 +2488,97 @@ async def bulk_import_vendors(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error importing vendors: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+def import_job_response(job: dict, request: Request) -> dict:
+    """Public view of an import job"""
+    finished = job["status"] in ("completed", "failed")
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "file_name": job["file_name"],
+        "rows_processed": job["rows_processed"],
+        "imported_count": job["imported_count"],
+        "failed_count": job["failed_count"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "finished_at": job["finished_at"],
+        "rejected_rows_url": (
+            str(request.url_for("download_import_job_rejected_rows", job_id=job["job_id"]))
+            if finished and job["failed_count"] else None
+        )
+    }
+
+
+@router.post("/bulk/import-jobs", status_code=status.HTTP_202_ACCEPTED)
+def create_import_job(
+    request: Request,
+    file: UploadFile = File(...)
+    # current_user: User = Depends(get_current_active_user)  # Temporarily disabled for testing
+):
+    """Start a background bulk import; poll the returned job and download rejected rows when it finishes"""
+    # Temporarily use a default user ID for testing
+    current_user_id = 1
+    
+    file_extension = bulk_import_format(file)
+    
+    def log_import(job: dict):
+        compliance_logger.log_activity(
+            activity_type="BULK_VENDOR_IMPORT_JOB",
+            user_id=current_user_id,
+            vendor_id=None,
+            details={
+                "job_id": job["job_id"],
+                "file_name": job["file_name"],
+                "status": job["status"],
+                "rows_processed": job["rows_processed"],
+                "imported_count": job["imported_count"],
+                "failed_count": job["failed_count"],
+                "error": job["error"]
+            }
+        )
+    
+    job = import_jobs.submit(file.file, file.filename, file_extension, generate_vendor_code, log_import)
+    return import_job_response(job, request)
+
+
+@router.get("/bulk/import-jobs/{job_id}")
+def get_import_job(job_id: str, request: Request):
+    """Get the status and progress of an import job"""
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return import_job_response(job, request)
+
+
+@router.get("/bulk/import-jobs/{job_id}/rejected")
+def download_import_job_rejected_rows(job_id: str):
+    """Download the rejected rows of a finished import job as CSV, with the reason for each"""
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    if job["status"] not in ("completed", "failed"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Import job is {job['status']}"
+        )
+    path = import_jobs.rejected_path(job)
+    if not job["failed_count"] or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job has no rejected rows"
+        )
+    
+    return FileResponse(
+        path,
+        media_type="text/csv",
+        filename=f"vendors-import-rejected-{job['created_at'][:10].replace('-', '')}.csv"
+    )
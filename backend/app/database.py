@@ -1,10 +1,77 @@
-from sqlalchemy import create_engine
+import os
+import time
+import anyio
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from .config import settings
+from .utils.metrics import LatencyHistogram, Counter
+
+# Pool telemetry for this worker process
+pool_checkout_wait = LatencyHistogram()
+pool_checkout_timeouts = Counter()
+db_slot_wait = LatencyHistogram()
+
+# Every SQL statement this worker runs, requests and background jobs alike
+sql_query_duration = LatencyHistogram()
+
+# Statement count and total seconds of the request being served, set by LoggingMiddleware;
+# the dict is shared with the threadpool workers that run the request's handlers
+current_request_queries: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_request_queries", default=None)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_checkout_timeouts.inc()
+            raise
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - start)
+
+
+# SQLite connections are handed between threadpool workers (route handlers
+# and dependencies run off the event loop), so disable the same-thread check
+connect_args = {}
+if settings.database_url.startswith("sqlite"):
+    connect_args["check_same_thread"] = False
 
 # Create database engine
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    connect_args=connect_args,
+    poolclass=TimedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping
+)
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def record_query_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    sql_query_duration.observe(elapsed)
+    request_queries = current_request_queries.get()
+    if request_queries is not None:
+        request_queries["count"] += 1
+        request_queries["seconds"] += elapsed
+
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -12,11 +79,45 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create Base class
 Base = declarative_base()
 
+# Requests wait here, on the event loop, for a free database slot before any
+# worker thread touches the pool. A thread blocked on pool checkout would hold
+# a threadpool token that finished requests need in order to release theirs.
+db_max_concurrency = settings.db_max_concurrency or (settings.db_pool_size + settings.db_max_overflow)
+db_slots = anyio.Semaphore(db_max_concurrency)
+
 
-def get_db():
+async def get_db():
     """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+    start = time.perf_counter()
+    async with db_slots:
+        db_slot_wait.observe(time.perf_counter() - start)
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Live connection pool statistics for this worker process"""
+    pool = engine.pool
+    return {
+        "pid": os.getpid(),
+        "pool": {
+            "size": pool.size(),
+            "max_overflow": settings.db_max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "timeout": pool.timeout(),
+            "recycle": settings.db_pool_recycle,
+            "pre_ping": settings.db_pool_pre_ping
+        },
+        "checkout_wait_seconds": pool_checkout_wait.snapshot(),
+        "checkout_timeouts": pool_checkout_timeouts.value,
+        "db_slots": {
+            "limit": db_max_concurrency,
+            "available": db_slots.value
+        },
+        "slot_wait_seconds": db_slot_wait.snapshot()
+    }
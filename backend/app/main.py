@@ -1,14 +1,29 @@
-from fastapi import FastAPI
+import anyio.to_thread
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from .config import settings
 from .database import engine, Base
-from .api import auth, vendors, approvals, documents, dashboard
+from .api import auth, vendors, approvals, documents, dashboard, internal
 from .middleware.logging_middleware import LoggingMiddleware, AuditMiddleware
+from .utils.vendor_search import ensure_search_index
+from .utils.status_rollup import ensure_status_rollup
+from .utils.export_jobs import export_jobs
+from .utils.import_jobs import import_jobs
+from .utils.vendor_import import shutdown_validation_pool, warm_validation_pool
+from .utils.logger import compliance_logger
+from .utils.request_metrics import metrics_flusher
+from .utils.prometheus import CONTENT_TYPE, metrics_snapshot_writer, render_metrics
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Prepare the vendor search index for this database
+ensure_search_index(engine)
+
+# Install or verify the triggers that maintain the workflow status counters
+ensure_status_rollup(engine)
+
 # Create FastAPI app
 app = FastAPI(
     title="Vendor Management System API",
@@ -18,6 +33,46 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+
+@app.on_event("startup")
+async def configure_thread_pool():
+    """Size the threadpool that runs blocking route handlers and dependencies"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_pool_size
+
+
+@app.on_event("startup")
+def start_log_writers():
+    """Move log file and console writes off request threads onto per-category writer threads"""
+    compliance_logger.start()
+    metrics_flusher.start()
+    metrics_snapshot_writer.start()
+
+
+@app.on_event("startup")
+def recover_background_jobs():
+    """Fail jobs a previous process left queued or running, so they are not polled or shared forever,
+    and start the import validation processes in the background"""
+    export_jobs.recover_orphaned()
+    import_jobs.recover_orphaned()
+    warm_validation_pool()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    """Stop the export and import worker pools"""
+    export_jobs.shutdown()
+    import_jobs.shutdown()
+    shutdown_validation_pool()
+
+
+@app.on_event("shutdown")
+def flush_logs():
+    """Write out route metrics and every queued log record (the audit trail never drops) before exiting"""
+    metrics_snapshot_writer.stop()
+    metrics_flusher.stop()
+    compliance_logger.shutdown()
+
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -36,7 +91,7 @@ app.add_middleware(
         "Access-Control-Request-Headers",
         "Cache-Control"
     ],
-    expose_headers=["Content-Length", "Content-Range"],
+    expose_headers=["Content-Length", "Content-Range", "X-Next-Cursor"],
     max_age=86400,  # 24 hours
 )
 
@@ -56,6 +111,7 @@ app.include_router(vendors.router, prefix="/api/v1")
 app.include_router(approvals.router, prefix="/api/v1")
 app.include_router(documents.router, prefix="/api/v1")
 app.include_router(dashboard.router, prefix="/api/v1")
+app.include_router(internal.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -75,6 +131,12 @@ async def health_check():
     return {"status": "healthy", "message": "API is running"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics of every worker process on this host"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
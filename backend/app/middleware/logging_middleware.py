@@ -1,9 +1,10 @@
 import time
-import json
-from typing import Callable
+from typing import AsyncIterator, Callable
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from ..database import current_request_queries
 from ..utils.logger import compliance_logger
+from ..utils.request_metrics import record_request
 
 
 class LoggingMiddleware(BaseHTTPMiddleware):
@@ -24,6 +25,10 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         # Log request
         self._log_request(request, client_ip, user_id)
         
+        # Count the SQL statements run while serving this request
+        queries = {"count": 0, "seconds": 0.0}
+        token = current_request_queries.set(queries)
+        
         try:
             # Process request
             response = await call_next(request)
@@ -34,13 +39,21 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             # Log response
             self._log_response(request, response, duration, client_ip, user_id)
             
+            # call_next returns once the headers are ready; record metrics when the body is sent,
+            # so streamed exports count their full duration and queries
+            response.body_iterator = self._record_when_sent(
+                response.body_iterator, request, response.status_code, start_time, queries
+            )
+            
             return response
             
         except Exception as e:
             # Log error
             duration = time.time() - start_time
-            self._log_error(request, e, duration, client_ip, user_id)
+            self._log_error(request, e, duration, client_ip, user_id, queries)
             raise
+        finally:
+            current_request_queries.reset(token)
 
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP address from request"""
@@ -71,12 +84,22 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         
         # Log sensitive endpoints with extra detail
         if request.url.path.startswith('/api/v1/vendors/public-registration'):
-            compliance_logger.app_logger.info(f"Vendor Registration Request: {json.dumps(log_data, indent=2)}")
+            compliance_logger.app_logger.info("Vendor Registration Request", extra={"event": log_data})
         elif request.url.path.startswith('/api/v1/auth'):
-            compliance_logger.security_logger.info(f"Authentication Request: {json.dumps(log_data, indent=2)}")
+            compliance_logger.security_logger.info("Authentication Request", extra={"event": log_data})
         else:
             compliance_logger.app_logger.info(f"Request: {request.method} {request.url.path} from {client_ip}")
 
+    async def _record_when_sent(self, body: AsyncIterator[bytes], request: Request, status_code: int,
+                                start_time: float, queries: dict) -> AsyncIterator[bytes]:
+        """Pass the response body through, then aggregate the request's metrics per route"""
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            # Only a sample is logged in full
+            record_request(request, status_code, time.time() - start_time, queries)
+
     def _log_response(self, request: Request, response: Response, duration: float, 
                      client_ip: str, user_id: int = None):
         """Log response"""
@@ -89,21 +112,14 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             'user_id': user_id
         }
         
-        # Log performance metrics
-        compliance_logger.log_performance_metric(
-            operation=f"{request.method}_{request.url.path}",
-            duration=duration,
-            resource_usage={'status_code': response.status_code}
-        )
-        
         # Log specific activities
         if request.url.path.startswith('/api/v1/vendors') and response.status_code == 201:
-            compliance_logger.vendor_logger.info(f"Vendor created successfully: {json.dumps(log_data, indent=2)}")
+            compliance_logger.vendor_logger.info("Vendor created successfully", extra={"event": log_data})
         elif response.status_code >= 400:
-            compliance_logger.error_logger.warning(f"Error response: {json.dumps(log_data, indent=2)}")
+            compliance_logger.error_logger.warning("Error response", extra={"event": log_data})
 
     def _log_error(self, request: Request, error: Exception, duration: float, 
-                  client_ip: str, user_id: int = None):
+                  client_ip: str, user_id: int = None, queries: dict = None):
         """Log errors"""
         log_data = {
             'method': request.method,
@@ -115,13 +131,15 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             'user_id': user_id
         }
         
+        record_request(request, 500, duration, queries)
+        
         compliance_logger.log_system_error(
             error=error,
             context=f"Request: {request.method} {request.url.path}",
             user_id=user_id
         )
         
-        compliance_logger.error_logger.error(f"Request Error: {json.dumps(log_data, indent=2)}")
+        compliance_logger.error_logger.error("Request Error", extra={"event": log_data})
 
 
 class AuditMiddleware(BaseHTTPMiddleware):
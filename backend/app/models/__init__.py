@@ -2,6 +2,7 @@ from .user import User
 from .vendor import Vendor, VendorAddress, VendorBankInfo, VendorCompliance, VendorAgreement, VendorAgreementDetail, VendorComplianceCertificate
 from .vendor_approval import VendorApproval
 from .vendor_document import VendorDocument
+from .status_rollup import StatusRollup
 
 __all__ = [
     "User",
@@ -13,5 +14,6 @@ __all__ = [
     "VendorAgreementDetail",
     "VendorComplianceCertificate",
     "VendorApproval",
-    "VendorDocument"
+    "VendorDocument",
+    "StatusRollup"
 ] 
\ No newline at end of file
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+
+class StatusRollup(Base):
+    """Precomputed row counts per workflow status, maintained by database triggers
+
+    scope 'vendor' is keyed by vendor status; scope 'approval' is keyed by
+    '<level>:<status>' of vendor approvals.
+    """
+    __tablename__ = "status_rollups"
+
+    scope = Column(String(32), primary_key=True)
+    key = Column(String(64), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
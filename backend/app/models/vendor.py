@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, ForeignKey, Float, Date, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, ForeignKey, Float, Date, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -117,6 +117,18 @@ class Vendor(Base):
     compliance_certificates = relationship("VendorComplianceCertificate", back_populates="vendor", cascade="all, delete-orphan")
     documents = relationship("VendorDocument", back_populates="vendor", cascade="all, delete-orphan")
     approvals = relationship("VendorApproval", back_populates="vendor", cascade="all, delete-orphan")
+    
+    # Composite indexes backing keyset pagination (filter column, then id)
+    __table_args__ = (
+        Index('ix_vendors_status_id', 'status', 'id'),
+        Index('ix_vendors_supplier_type_id', 'supplier_type', 'id'),
+        Index('ix_vendors_msme_status_id', 'msme_status', 'id'),
+        Index('ix_vendors_supplier_category_id', 'supplier_category', 'id'),
+        # Duplicate-email checks of vendor registration and bulk import
+        Index('ix_vendors_email', 'email'),
+        # Newest-first pages of the dashboard activity feed
+        Index('ix_vendors_created_at_id', 'created_at', 'id'),
+    )
 
 
 class VendorAddress(Base):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -34,4 +34,9 @@ class VendorApproval(Base):
     
     # Relationships
     vendor = relationship("Vendor", back_populates="approvals")
-    approver = relationship("User") 
\ No newline at end of file
+    approver = relationship("User")
+    
+    # Newest-first pages of approvals in the dashboard activity feed (status, then the activity timestamp)
+    __table_args__ = (
+        Index('ix_vendor_approvals_status_activity', status, func.coalesce(approved_at, created_at), id),
+    ) 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -47,4 +47,9 @@ class VendorDocument(Base):
     # Relationships
     vendor = relationship("Vendor", back_populates="documents")
     uploader = relationship("User", foreign_keys=[uploaded_by])
-    reviewer = relationship("User", foreign_keys=[reviewed_by]) 
\ No newline at end of file
+    reviewer = relationship("User", foreign_keys=[reviewed_by])
+    
+    # Newest-first pages of the dashboard activity feed
+    __table_args__ = (
+        Index('ix_vendor_documents_created_at_id', 'created_at', 'id'),
+    ) 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from ..models.vendor import VendorStatus, VendorType, MSMEStatus
 
@@ -424,4 +424,25 @@ class VendorComplianceCertificateResponse(VendorComplianceCertificateBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+# Vendor Detail Schemas
+class VendorDetailResponse(VendorResponse):
+    # Related records, present only when requested through ?include=
+    addresses: Optional[List[VendorAddressResponse]] = None
+    bank_info: Optional[VendorBankInfoResponse] = None
+    compliance_certificates: Optional[List[VendorComplianceCertificateResponse]] = None
+    agreement_details: Optional[List[VendorAgreementDetailResponse]] = None
+
+
+class VendorBatchItem(BaseModel):
+    found: bool
+    vendor: Optional[VendorDetailResponse] = None
+    detail: Optional[str] = None
+
+
+class VendorBatchResponse(BaseModel):
+    # Keyed by requested vendor ID, in request order
+    vendors: Dict[int, VendorBatchItem]
+    found_count: int
+    not_found_count: int
@@ -0,0 +1,170 @@
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from .metrics import LabeledCounter
+
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Identifies this process in the jobs it owns; the pid alone is reused, e.g. pid 1 in every container start
+PROCESS_TOKEN = f"{os.getpid()}-{uuid.uuid4().hex}"
+
+UNFINISHED_STATUSES = ("queued", "running")
+
+# Jobs of this worker process by kind and outcome: submitted, cached, completed, failed
+job_events = LabeledCounter(("kind", "outcome"))
+
+
+class FileJobManager:
+    """Runs jobs on a small worker pool, keeping each job's state in a JSON file under job_dir
+
+    File-backed state lets every app worker process on the host report status
+    and serve artifacts. Finished jobs and their files are purged artifact_ttl
+    seconds after they finish. A queued or running job whose owning process is
+    gone is marked failed the next time it is read.
+    """
+
+    kind = "job"
+    thread_name_prefix = "job"
+
+    def __init__(self, job_dir: str, max_workers: int, artifact_ttl: int):
+        self.job_dir = job_dir
+        self.max_workers = max_workers
+        self.artifact_ttl = artifact_ttl
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Tuple[Future, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    # Job state files
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def _save(self, job: Dict[str, Any]):
+        path = self._job_path(job["job_id"])
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(job, f)
+        os.replace(f"{path}.tmp", path)
+
+    def _update(self, job: Dict[str, Any], **changes):
+        job.update(changes, updated_at=datetime.utcnow().isoformat())
+        self._save(job)
+
+    def _finish(self, job: Dict[str, Any], status: str, **changes):
+        self._update(job, status=status, finished_at=datetime.utcnow().isoformat(), finished_ts=time.time(), **changes)
+        job_events.labels(self.kind, status).inc()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a job, or None if it does not exist or has expired"""
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self._job_path(job_id), encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self._is_orphaned(job):
+            self._finish(job, "failed", error="Interrupted: the process running this job stopped")
+            self._on_orphaned(job)
+        return job
+
+    def _is_orphaned(self, job: Dict[str, Any]) -> bool:
+        """Whether a queued or running job belongs to a process that no longer exists"""
+        if job["status"] not in UNFINISHED_STATUSES:
+            return False
+        owner = job.get("owner")
+        if not owner:
+            return True
+        if owner == PROCESS_TOKEN:
+            return False
+        pid = int(owner.split("-", 1)[0])
+        if pid == os.getpid():
+            return True  # an earlier process that had this pid
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def _on_orphaned(self, job: Dict[str, Any]):
+        pass
+
+    def _new_job(self, **fields) -> Dict[str, Any]:
+        """Create and save the state of a queued job"""
+        now = datetime.utcnow().isoformat()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+            "finished_ts": None,
+            "owner": PROCESS_TOKEN,
+            **fields
+        }
+        self._save(job)
+        job_events.labels(self.kind, "submitted").inc()
+        return job
+
+    def _start(self, job: Dict[str, Any], fn, *args):
+        """Run fn(job, *args) on the worker pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+        future = self._executor.submit(fn, job, *args)
+        self._futures[job["job_id"]] = (future, job)
+        future.add_done_callback(lambda _: self._futures.pop(job["job_id"], None))
+
+    # Cleanup
+
+    def _job_files(self, job: Dict[str, Any]) -> List[str]:
+        """Files owned by a job, removed together with its state when it expires"""
+        return []
+
+    def _on_purge(self, job: Dict[str, Any]):
+        pass
+
+    def recover_orphaned(self):
+        """Mark jobs left queued or running by a stopped process as failed"""
+        try:
+            names = os.listdir(self.job_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".json"):
+                self.get(name[:-len(".json")])
+
+    def purge_expired(self):
+        """Delete files and state of jobs that finished more than artifact_ttl seconds ago"""
+        cutoff = time.time() - self.artifact_ttl
+        try:
+            names = os.listdir(self.job_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            job = self.get(name[:-len(".json")])
+            if job and job.get("finished_ts") and job["finished_ts"] < cutoff:
+                self._on_purge(job)
+                for path in self._job_files(job) + [self._job_path(job["job_id"])]:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def shutdown(self):
+        """Stop accepting work; queued jobs that never started are marked failed"""
+        if self._executor is not None:
+            # Cancelling a future runs its done callback, which forgets it
+            pending = list(self._futures.values())
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            for future, job in pending:
+                if future.cancelled():
+                    self._finish(job, "failed", error="Cancelled: the server shut down before the job started")
+                    self._on_orphaned(job)
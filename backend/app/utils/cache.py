@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after ttl_seconds"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        # Bumped on every clear() so a value computed before an invalidation
+        # is never stored after it
+        self._generation = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            if generation == self._generation:
+                now = time.monotonic()
+                # Drop expired entries so keys that are never requested again don't pile up
+                for expired in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                    del self._entries[expired]
+                self._entries[key] = (now + self.ttl_seconds, value)
+        return value
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+def invalidate_on_commit(cache: TTLCache, models: Iterable[type]):
+    """Clear cache after any session commit that inserted, updated or deleted rows of models"""
+    models = tuple(models)
+    flag = f"invalidate_cache_{id(cache)}"
+
+    @event.listens_for(Session, "after_flush")
+    def _mark_flushed_writes(session, flush_context):
+        if any(isinstance(obj, models) for obj in (*session.new, *session.dirty, *session.deleted)):
+            session.info[flag] = True
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _mark_bulk_writes(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            mapper = orm_execute_state.bind_mapper
+            if mapper is not None and issubclass(mapper.class_, models):
+                orm_execute_state.session.info[flag] = True
+
+    @event.listens_for(Session, "after_commit")
+    def _clear_after_commit(session):
+        if session.info.pop(flag, False):
+            cache.clear()
+
+    @event.listens_for(Session, "after_rollback")
+    def _forget_rolled_back(session):
+        session.info.pop(flag, None)
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from sqlalchemy.orm import Query, Session
+from ..config import settings
+from ..database import SessionLocal
+from .background_jobs import FileJobManager, job_events
+from .vendor_export import iter_export_rows, iter_export_records, stream_csv, stream_ndjson, write_excel
+
+EXPORT_EXTENSIONS = {"csv": "csv", "json": "ndjson", "excel": "xlsx"}
+
+# Rows between two progress updates of a running job
+PROGRESS_INTERVAL = 1000
+
+
+def export_cache_key(export_format: str, params: Dict[str, Any]) -> str:
+    """Stable key for an export request: identical format and parameters share artifacts"""
+    raw = json.dumps({"format": export_format, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ExportJobManager(FileJobManager):
+    """Runs vendor exports in the background, writing artifacts to export_dir
+
+    A finished artifact is reused by identical requests until it is
+    artifact_ttl seconds old.
+    """
+
+    kind = "export"
+    thread_name_prefix = "export-job"
+
+    def _key_path(self, cache_key: str) -> str:
+        return os.path.join(self.job_dir, f"{cache_key}.key")
+
+    def artifact_path(self, job: Dict[str, Any]) -> str:
+        return os.path.join(self.job_dir, f"{job['job_id']}.{EXPORT_EXTENSIONS[job['format']]}")
+
+    def _is_reusable(self, job: Optional[Dict[str, Any]]) -> bool:
+        if not job or job["status"] == "failed":
+            return False
+        if job["status"] != "completed":
+            return True  # still queued or running: share it
+        return time.time() - job["finished_ts"] < self.artifact_ttl and os.path.exists(self.artifact_path(job))
+
+    # Submission and execution
+
+    def submit(self, export_format: str, params: Dict[str, Any],
+               query_factory: Callable[[Session, bool], Query],
+               on_complete: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """Queue an export, or return the job of an identical recent or in-flight export
+
+        query_factory(db, include_id) builds the export query on the worker's own session.
+        """
+        os.makedirs(self.job_dir, exist_ok=True)
+        self.purge_expired()
+        cache_key = export_cache_key(export_format, params)
+
+        with self._lock:
+            try:
+                with open(self._key_path(cache_key), encoding="utf-8") as f:
+                    existing = self.get(f.read().strip())
+            except OSError:
+                existing = None
+            if self._is_reusable(existing):
+                job_events.labels(self.kind, "cached").inc()
+                return dict(existing, cached=True)
+
+            job = self._new_job(
+                format=export_format, params=params, cache_key=cache_key, rows_processed=0, total_rows=None
+            )
+            with open(self._key_path(cache_key), "w", encoding="utf-8") as f:
+                f.write(job["job_id"])
+
+            self._start(job, self._run, query_factory, on_complete)
+        return dict(job, cached=False)
+
+    def _track_progress(self, job: Dict[str, Any], rows: Iterator) -> Iterator:
+        count = 0
+        for row in rows:
+            yield row
+            count += 1
+            if count % PROGRESS_INTERVAL == 0:
+                self._update(job, rows_processed=count)
+        job["rows_processed"] = count
+
+    def _run(self, job: Dict[str, Any], query_factory, on_complete):
+        db = SessionLocal()
+        path = self.artifact_path(job)
+        partial = f"{path}.part"
+        try:
+            self._update(job, status="running", total_rows=query_factory(db, False).order_by(None).count())
+
+            if job["format"] == "excel":
+                # openpyxl refuses to save without an .xlsx suffix
+                partial = f"{path}.part.xlsx"
+                write_excel(self._track_progress(job, iter_export_rows(query_factory(db, False))), partial)
+            else:
+                if job["format"] == "json":
+                    chunks = stream_ndjson(self._track_progress(job, iter_export_records(query_factory(db, True))))
+                else:
+                    chunks = stream_csv(self._track_progress(job, iter_export_rows(query_factory(db, False))))
+                with open(partial, "wb") as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+            os.replace(partial, path)
+
+            self._finish(job, "completed")
+            if on_complete:
+                on_complete(job["rows_processed"])
+        except Exception as e:
+            if os.path.exists(partial):
+                os.remove(partial)
+            self._finish(job, "failed", error=str(e))
+        finally:
+            db.close()
+
+    def _job_files(self, job: Dict[str, Any]) -> List[str]:
+        return [self.artifact_path(job)]
+
+    def _on_purge(self, job: Dict[str, Any]):
+        # Drop the cache pointer unless a newer job has taken it over
+        try:
+            with open(self._key_path(job["cache_key"]), encoding="utf-8") as f:
+                if f.read().strip() == job["job_id"]:
+                    os.remove(self._key_path(job["cache_key"]))
+        except OSError:
+            pass
+
+
+export_jobs = ExportJobManager(settings.export_dir, settings.export_workers, settings.export_artifact_ttl)
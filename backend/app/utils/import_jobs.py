@@ -0,0 +1,104 @@
+import csv
+import os
+import shutil
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+from ..config import settings
+from ..database import SessionLocal
+from .background_jobs import FileJobManager
+from .metrics import LabeledCounter
+from .vendor_import import import_vendor_chunks, iter_csv_rows, iter_excel_rows
+
+# Rows handled by background imports of this worker process: imported or rejected
+import_rows = LabeledCounter(("outcome",))
+
+
+class ImportJobManager(FileJobManager):
+    """Runs vendor bulk imports in the background from uploads saved to import_dir
+
+    Every chunk is committed on its own, so a failure late in the file keeps the
+    vendors imported before it. Rejected rows are written, with their original
+    values and the reason, to a CSV report that stays downloadable for artifact_ttl
+    seconds after the job finishes.
+    """
+
+    kind = "import"
+    thread_name_prefix = "import-job"
+
+    def upload_path(self, job: Dict[str, Any]) -> str:
+        return os.path.join(self.job_dir, f"{job['job_id']}.upload.{job['file_format']}")
+
+    def rejected_path(self, job: Dict[str, Any]) -> str:
+        return os.path.join(self.job_dir, f"{job['job_id']}.rejected.csv")
+
+    def submit(self, upload: BinaryIO, file_name: str, file_format: str, generate_code: Callable[[], str],
+               on_finish: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Save the upload and queue its import; on_finish(job) runs once it completes or fails"""
+        os.makedirs(self.job_dir, exist_ok=True)
+        self.purge_expired()
+
+        job = self._new_job(
+            file_name=file_name, file_format=file_format,
+            rows_processed=0, imported_count=0, failed_count=0
+        )
+        try:
+            with open(self.upload_path(job), "wb") as f:
+                shutil.copyfileobj(upload, f)
+        except Exception as e:
+            self._finish(job, "failed", error=f"Could not store upload: {e}")
+            return job
+
+        self._start(job, self._run, generate_code, on_finish)
+        return job
+
+    def _run(self, job: Dict[str, Any], generate_code, on_finish):
+        db = SessionLocal()
+        report = None
+        writer = None
+        try:
+            self._update(job, status="running")
+            with open(self.upload_path(job), "rb") as upload:
+                rows = iter_csv_rows(upload) if job["file_format"] == "csv" else iter_excel_rows(upload)
+                for rows_read, imported, rejected in import_vendor_chunks(db, rows, generate_code):
+                    db.commit()
+
+                    if rejected and writer is None:
+                        # Keep the uploaded columns so fixed rows can be imported again
+                        columns = [column for column in rejected[0][1] if column is not None]
+                        report = open(self.rejected_path(job), "w", newline="", encoding="utf-8")
+                        writer = csv.DictWriter(report, ["Row", *columns, "Error"], restval="", extrasaction="ignore")
+                        writer.writeheader()
+                    for row_num, row, error in rejected:
+                        writer.writerow({**row, "Row": row_num, "Error": error})
+                    import_rows.labels("imported").inc(imported)
+                    import_rows.labels("rejected").inc(len(rejected))
+
+                    self._update(
+                        job,
+                        rows_processed=job["rows_processed"] + rows_read,
+                        imported_count=job["imported_count"] + imported,
+                        failed_count=job["failed_count"] + len(rejected)
+                    )
+            self._finish(job, "completed")
+        except Exception as e:
+            db.rollback()
+            self._finish(job, "failed", error=str(e))
+        finally:
+            if report is not None:
+                report.close()
+            db.close()
+            if os.path.exists(self.upload_path(job)):
+                os.remove(self.upload_path(job))
+
+        if on_finish:
+            on_finish(job)
+
+    def _on_orphaned(self, job: Dict[str, Any]):
+        # The upload will never be imported; don't keep it until the report expires
+        if os.path.exists(self.upload_path(job)):
+            os.remove(self.upload_path(job))
+
+    def _job_files(self, job: Dict[str, Any]) -> List[str]:
+        return [self.rejected_path(job), self.upload_path(job)]
+
+
+import_jobs = ImportJobManager(settings.import_dir, settings.import_workers, settings.import_report_ttl)
@@ -0,0 +1,176 @@
+"""
+Log retention and rotation policy shared by ComplianceLogger and logging_config.py
+
+Retention windows come from the compliance requirements: each log category keeps
+its rotated files for the longest retention period of any event type it records.
+"""
+
+import re
+from typing import Dict, Iterable
+
+# Compliance-specific logging categories
+COMPLIANCE_CATEGORIES = {
+    'VENDOR_REGISTRATION': {
+        'description': 'Vendor registration activities',
+        'retention_days': 2555,  # 7 years
+        'critical': True
+    },
+    'VENDOR_STATUS_CHANGE': {
+        'description': 'Vendor status modifications',
+        'retention_days': 2555,  # 7 years
+        'critical': True
+    },
+    'DOCUMENT_UPLOAD': {
+        'description': 'Document upload activities',
+        'retention_days': 2555,  # 7 years
+        'critical': True
+    },
+    'COMPLIANCE_VIOLATION': {
+        'description': 'Compliance violations and issues',
+        'retention_days': 3650,  # 10 years
+        'critical': True
+    },
+    'SECURITY_EVENT': {
+        'description': 'Security-related events',
+        'retention_days': 1825,  # 5 years
+        'critical': True
+    },
+    'USER_ACTIVITY': {
+        'description': 'User activity tracking',
+        'retention_days': 1095,  # 3 years
+        'critical': False
+    },
+    'DATA_ACCESS': {
+        'description': 'Data access and retrieval',
+        'retention_days': 1095,  # 3 years
+        'critical': False
+    },
+    'PERFORMANCE_METRIC': {
+        'description': 'System performance metrics',
+        'retention_days': 365,  # 1 year
+        'critical': False
+    }
+}
+
+# Manufacturing compliance requirements
+MANUFACTURING_COMPLIANCE_REQUIREMENTS = {
+    'ISO_9001': {
+        'description': 'Quality Management System',
+        'logging_requirements': [
+            'VENDOR_REGISTRATION',
+            'VENDOR_STATUS_CHANGE',
+            'DOCUMENT_UPLOAD',
+            'COMPLIANCE_VIOLATION'
+        ],
+        'retention_period': '7 years'
+    },
+    'ISO_14001': {
+        'description': 'Environmental Management System',
+        'logging_requirements': [
+            'VENDOR_REGISTRATION',
+            'COMPLIANCE_VIOLATION'
+        ],
+        'retention_period': '7 years'
+    },
+    'ISO_45001': {
+        'description': 'Occupational Health and Safety',
+        'logging_requirements': [
+            'VENDOR_REGISTRATION',
+            'COMPLIANCE_VIOLATION',
+            'SECURITY_EVENT'
+        ],
+        'retention_period': '7 years'
+    },
+    'FDA_21_CFR_PART_11': {
+        'description': 'Electronic Records and Signatures',
+        'logging_requirements': [
+            'VENDOR_REGISTRATION',
+            'VENDOR_STATUS_CHANGE',
+            'DOCUMENT_UPLOAD',
+            'USER_ACTIVITY',
+            'DATA_ACCESS'
+        ],
+        'retention_period': '10 years'
+    },
+    'GDPR': {
+        'description': 'General Data Protection Regulation',
+        'logging_requirements': [
+            'USER_ACTIVITY',
+            'DATA_ACCESS',
+            'SECURITY_EVENT'
+        ],
+        'retention_period': '3 years'
+    }
+}
+
+
+# Log file per category, with the size that triggers rotation and the rotated
+# segments always kept; event_types decides the retention window
+LOG_CATEGORIES = {
+    'app': {
+        'filename': 'logs/application.log',
+        'max_bytes': 10485760,  # 10MB
+        'backup_count': 5,
+        'event_types': []
+    },
+    'audit': {
+        'filename': 'logs/audit_trail.log',
+        'max_bytes': 10485760,  # 10MB
+        'backup_count': 10,  # Keep more audit logs
+        'event_types': [
+            'VENDOR_REGISTRATION', 'VENDOR_STATUS_CHANGE', 'DOCUMENT_UPLOAD',
+            'COMPLIANCE_VIOLATION', 'USER_ACTIVITY', 'DATA_ACCESS'
+        ]
+    },
+    'security': {
+        'filename': 'logs/security.log',
+        'max_bytes': 10485760,  # 10MB
+        'backup_count': 10,
+        'event_types': ['SECURITY_EVENT']
+    },
+    'vendor': {
+        'filename': 'logs/vendor_activity.log',
+        'max_bytes': 10485760,  # 10MB
+        'backup_count': 5,
+        'event_types': ['VENDOR_REGISTRATION', 'VENDOR_STATUS_CHANGE', 'DOCUMENT_UPLOAD']
+    },
+    'performance': {
+        'filename': 'logs/performance.log',
+        'max_bytes': 10485760,  # 10MB
+        'backup_count': 3,
+        'event_types': ['PERFORMANCE_METRIC']
+    },
+    'error': {
+        'filename': 'logs/errors.log',
+        'max_bytes': 10485760,  # 10MB
+        'backup_count': 5,
+        'event_types': ['COMPLIANCE_VIOLATION']
+    }
+}
+
+RETENTION_UNIT_DAYS = {'day': 1, 'month': 30, 'year': 365}
+
+
+def parse_retention_period(period: str) -> int:
+    """Days in a retention period such as '7 years'"""
+    match = re.match(r'^\s*(\d+)\s*(day|month|year)s?\s*$', period, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Unrecognised retention period: {period!r}")
+    return int(match.group(1)) * RETENTION_UNIT_DAYS[match.group(2).lower()]
+
+
+def retention_days(event_types: Iterable[str]) -> int:
+    """Longest retention any requirement (or compliance category) sets for these event types; 0 if none"""
+    days = 0
+    for event_type in event_types:
+        for requirement in MANUFACTURING_COMPLIANCE_REQUIREMENTS.values():
+            if event_type in requirement['logging_requirements']:
+                days = max(days, parse_retention_period(requirement['retention_period']))
+        days = max(days, COMPLIANCE_CATEGORIES.get(event_type, {}).get('retention_days', 0))
+    return days
+
+
+# Days rotated files of each log category must be kept
+CATEGORY_RETENTION_DAYS: Dict[str, int] = {
+    name: retention_days(category['event_types']) for name, category in LOG_CATEGORIES.items()
+}
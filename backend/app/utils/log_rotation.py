@@ -0,0 +1,186 @@
+import glob
+import gzip
+import logging
+import logging.handlers
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no inter-process locking, so only one process may write each log file
+    fcntl = None
+
+# One background thread gzips rotated segments for every log file
+_compressor: Optional[ThreadPoolExecutor] = None
+_compressor_lock = threading.Lock()
+
+
+def _submit(fn, *args):
+    global _compressor
+    with _compressor_lock:
+        if _compressor is None:
+            _compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+        _compressor.submit(fn, *args)
+
+
+def wait_for_compression():
+    """Block until every queued compression and cleanup has finished"""
+    global _compressor
+    with _compressor_lock:
+        compressor, _compressor = _compressor, None
+    if compressor is not None:
+        compressor.shutdown(wait=True)
+
+
+@contextmanager
+def _flocked(file, exclusive: bool):
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class CompressingRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """Log file rotated when it reaches max_bytes or at local midnight, whichever comes first
+
+    Rotated segments are renamed to <file>.<YYYYmmdd-HHMMSS-ffffff> and gzipped on a
+    background thread, so the writer never waits on compression. Old segments
+    are deleted only once they are beyond the newest backup_count and older than
+    retention_days; a retention window of 0 leaves backup_count alone in charge.
+
+    Several processes (uvicorn workers) may write the same file. Writes hold a
+    shared lock on a sidecar .<file>.lock and rotation holds it exclusively, so
+    the first process due to rotate renames the file, and every other one
+    reopens the new file by inode, as WatchedFileHandler does, before its next
+    write. No record lands in a segment after it was renamed, and each segment
+    is compressed by one process only. Without fcntl (Windows) there is no
+    locking and only one process may write these logs.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, retention_days: int = 0,
+                 encoding: str = 'utf-8'):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        super().__init__(filename, 'a', encoding=encoding)
+        directory, name = os.path.split(self.baseFilename)
+        self._lock_file = open(os.path.join(directory, f".{name}.lock"), 'a')
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.retention_days = retention_days
+        started = os.path.getmtime(self.baseFilename) if os.path.exists(self.baseFilename) else time.time()
+        self.rollover_at = self._next_midnight(started)
+        # Finish the work of a previous process that stopped mid-way
+        for segment in self._segments():
+            if not segment.endswith('.gz'):
+                _submit(self._compress, segment)
+        _submit(self._purge)
+
+    @staticmethod
+    def _next_midnight(timestamp: float) -> float:
+        day = datetime.fromtimestamp(timestamp).date() + timedelta(days=1)
+        return datetime(day.year, day.month, day.day).timestamp()
+
+    def _segments(self):
+        """Rotated segments of this file, oldest first (the timestamp suffix sorts by age)"""
+        return sorted(
+            (path for path in glob.glob(f"{glob.escape(self.baseFilename)}.*") if not path.endswith('.tmp')),
+            key=lambda path: path[:-len('.gz')] if path.endswith('.gz') else path
+        )
+
+    def _reopen_if_moved(self):
+        """Reopen the file if another process rotated it since this one opened it"""
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        if self.stream is not None:
+            opened = os.fstat(self.stream.fileno())
+            if current is not None and (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino):
+                return
+            self.stream.close()
+        self.stream = self._open()
+        self.rollover_at = self._next_midnight(time.time())
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.shouldRollover(record):
+                with _flocked(self._lock_file, exclusive=True):
+                    # Another process may have rotated while this one waited for the lock
+                    self._reopen_if_moved()
+                    if self.shouldRollover(record):
+                        self.doRollover()
+            with _flocked(self._lock_file, exclusive=False):
+                self._reopen_if_moved()
+                logging.FileHandler.emit(self, record)
+        except Exception:
+            self.handleError(record)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if time.time() >= self.rollover_at:
+            return True
+        # The file size, not this stream's position: other processes append to it too
+        return self.max_bytes > 0 and os.fstat(self.stream.fileno()).st_size >= self.max_bytes
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            # Microseconds keep names unique and in rotation order
+            segment = f"{self.baseFilename}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+            while os.path.exists(segment) or os.path.exists(f"{segment}.gz"):
+                segment = f"{self.baseFilename}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+            os.rename(self.baseFilename, segment)
+            _submit(self._compress, segment)
+            _submit(self._purge)
+
+        self.rollover_at = self._next_midnight(time.time())
+        self.stream = self._open()
+
+    def _compress(self, segment: str):
+        try:
+            source = open(segment, 'rb')
+        except FileNotFoundError:
+            return
+        with source:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(source, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return  # another process is compressing it
+            # It may have been compressed and removed since it was opened
+            if not os.path.exists(segment) or os.path.exists(f"{segment}.gz"):
+                return
+            with gzip.open(f"{segment}.gz.tmp", 'wb') as target:
+                shutil.copyfileobj(source, target)
+            # Keep the segment's age for retention
+            stat = os.fstat(source.fileno())
+            os.utime(f"{segment}.gz.tmp", (stat.st_atime, stat.st_mtime))
+            os.replace(f"{segment}.gz.tmp", f"{segment}.gz")
+            os.remove(segment)
+
+    def _purge(self):
+        segments = self._segments()
+        expired_before = time.time() - self.retention_days * 86400
+        for segment in segments[:max(len(segments) - self.backup_count, 0)]:
+            try:
+                if os.path.getmtime(segment) < expired_before:
+                    os.remove(segment)
+            except OSError:
+                pass
+
+    def close(self):
+        super().close()
+        self._lock_file.close()
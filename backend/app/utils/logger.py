@@ -1,15 +1,170 @@
+import atexit
 import logging
+import logging.handlers
 import json
 import os
+import queue
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
+from ..config import settings
+from .log_policy import LOG_CATEGORIES, CATEGORY_RETENTION_DAYS
+from .log_rotation import CompressingRotatingFileHandler, wait_for_compression
 from ..models.user import User
 from ..models.vendor import Vendor, VendorStatus
 from ..models.vendor_approval import VendorApproval
 from ..models.vendor_document import VendorDocument
 import traceback
 
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder produces the same JSON, only slower
+    orjson = None
+
+
+def json_dumps(value: Any) -> str:
+    """Compact single-line JSON; anything not natively serializable is written as str()"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return stdlib_json_dumps(value)
+
+
+def stdlib_json_dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class EventTextFormatter(logging.Formatter):
+    """Human-readable lines; a record's structured event (extra={"event": ...}) follows the message as compact JSON"""
+
+    def __init__(self, dumps=json_dumps):
+        super().__init__('%(asctime)s | %(name)s | %(levelname)s | %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+        self.dumps = dumps
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        event = getattr(record, "event", None)
+        return f"{line}: {self.dumps(event)}" if event is not None else line
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, logger, level, message and the structured event if any"""
+
+    def __init__(self, dumps=json_dumps):
+        super().__init__()
+        self.dumps = dumps
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(timespec="milliseconds") + "Z",
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        event = getattr(record, "event", None)
+        if event is not None:
+            entry["event"] = event
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return self.dumps(entry)
+
+
+LOG_FORMATTERS = {"text": EventTextFormatter, "json": JsonLinesFormatter}
+
+
+# Categories whose records must never be dropped, whatever log_drop_categories says
+NEVER_DROP_CATEGORIES = {"audit"}
+
+# What a category does with a record when its queue is full
+OVERFLOW_DROP = "drop"    # discard it at once
+OVERFLOW_WAIT = "wait"    # wait up to log_queue_put_timeout for room, then discard it
+OVERFLOW_WRITE = "write"  # write it on the caller's thread
+
+
+class CategoryQueueHandler(logging.handlers.QueueHandler):
+    """Hands a log category's records to a QueueListener thread that does the file and console writes
+
+    The queue is bounded, and overflow decides what happens when it is full
+    (see OVERFLOW_*). Callers include the event loop, so no policy waits
+    without a bound. Before start() and after stop(), records are written synchronously.
+    """
+
+    def __init__(self, category: str, handlers: List[logging.Handler], maxsize: int, overflow: str,
+                 put_timeout: float = 0.05):
+        super().__init__(queue.Queue(maxsize))
+        self.category = category
+        self.overflow = overflow
+        self.put_timeout = put_timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.handlers = handlers
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._running = False
+        self._state_lock = threading.Lock()
+
+    def start(self):
+        with self._state_lock:
+            if not self._running:
+                self.listener.start()
+                self._running = True
+
+    def stop(self):
+        """Write out everything queued, then fall back to synchronous writes"""
+        with self._state_lock:
+            if not self._running:
+                return
+            self._running = False
+            self.listener.stop()
+        # Records that raced past the listener's sentinel
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not None:  # QueueListener's stop sentinel
+                self._write(record)
+        for handler in self.handlers:
+            handler.flush()
+
+    def _write(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.overflow == OVERFLOW_WAIT:
+                self.queue.put(record, timeout=self.put_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == OVERFLOW_WRITE:
+                # The writer thread is behind; the file handlers' locks keep the two from interleaving
+                self._write(record)
+            else:
+                with self._dropped_lock:
+                    self.dropped += 1
+
+    def take_dropped(self) -> int:
+        """Dropped count since the last call"""
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def emit(self, record: logging.LogRecord):
+        if self._running:
+            super().emit(record)
+        else:
+            self._write(record)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "policy": self.overflow,
+            "dropped": self.dropped
+        }
+
 
 class ComplianceLogger:
     """Comprehensive logging system for manufacturing compliance"""
@@ -18,26 +173,29 @@ class ComplianceLogger:
         # Create logs directory if it doesn't exist
         os.makedirs('logs', exist_ok=True)
         
+        # Queue handlers by category; their writer threads start with start()
+        self.queue_handlers: Dict[str, CategoryQueueHandler] = {}
+        
         # Configure main application logger
-        self.app_logger = self._setup_logger('app', 'logs/application.log')
+        self.app_logger = self._setup_logger('app')
         
         # Configure compliance audit logger
-        self.audit_logger = self._setup_logger('audit', 'logs/audit_trail.log')
+        self.audit_logger = self._setup_logger('audit')
         
         # Configure security logger
-        self.security_logger = self._setup_logger('security', 'logs/security.log')
+        self.security_logger = self._setup_logger('security')
         
         # Configure vendor activity logger
-        self.vendor_logger = self._setup_logger('vendor', 'logs/vendor_activity.log')
+        self.vendor_logger = self._setup_logger('vendor')
         
         # Configure system performance logger
-        self.performance_logger = self._setup_logger('performance', 'logs/performance.log')
+        self.performance_logger = self._setup_logger('performance')
         
         # Configure error logger
-        self.error_logger = self._setup_logger('error', 'logs/errors.log')
+        self.error_logger = self._setup_logger('error')
 
-    def _setup_logger(self, name: str, log_file: str) -> logging.Logger:
-        """Setup individual logger with proper formatting"""
+    def _setup_logger(self, name: str) -> logging.Logger:
+        """Setup individual logger with proper formatting, rotation and retention"""
         logger = logging.getLogger(name)
         logger.setLevel(logging.INFO)
         
@@ -45,28 +203,62 @@ class ComplianceLogger:
         if logger.handlers:
             return logger
         
-        # File handler
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # File handler, rotated and compressed per the category's policy
+        policy = LOG_CATEGORIES[name]
+        file_handler = CompressingRotatingFileHandler(
+            policy['filename'], policy['max_bytes'], policy['backup_count'], CATEGORY_RETENTION_DAYS[name]
+        )
         file_handler.setLevel(logging.INFO)
         
         # Console handler for development
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         
-        # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s | %(name)s | %(levelname)s | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+        # Files use the configured format (text or JSON lines); the console stays human-readable
+        file_handler.setFormatter(LOG_FORMATTERS[settings.log_format]())
+        console_handler.setFormatter(EventTextFormatter())
         
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        # Callers only enqueue; the file and console writes happen on the category's writer thread
+        queue_handler = CategoryQueueHandler(
+            name,
+            [file_handler, console_handler],
+            maxsize=settings.log_queue_size,
+            overflow=self._overflow_policy(name),
+            put_timeout=settings.log_queue_put_timeout
+        )
+        queue_handler.setLevel(logging.INFO)
+        logger.addHandler(queue_handler)
+        self.queue_handlers[name] = queue_handler
         
         return logger
 
+    @staticmethod
+    def _overflow_policy(name: str) -> str:
+        if name in NEVER_DROP_CATEGORIES:
+            return OVERFLOW_WRITE
+        if name in settings.log_drop_categories:
+            return OVERFLOW_DROP
+        return OVERFLOW_WAIT
+
+    def start(self):
+        """Start the writer threads"""
+        for handler in self.queue_handlers.values():
+            handler.start()
+
+    def shutdown(self):
+        """Stop the writer threads once every queued record has been written"""
+        for handler in self.queue_handlers.values():
+            handler.stop()
+        wait_for_compression()
+        for name, handler in self.queue_handlers.items():
+            dropped = handler.take_dropped()
+            if dropped:
+                self.app_logger.warning(f"Dropped {dropped} {name} log records while its queue was full")
+
+    def queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Depth, capacity, overflow policy and dropped count of each category's queue"""
+        return {name: handler.stats() for name, handler in self.queue_handlers.items()}
+
     def log_vendor_registration(self, vendor_data: Dict[str, Any], user_id: Optional[int] = None, ip_address: str = None):
         """Log vendor registration activity"""
         log_entry = {
@@ -94,7 +286,7 @@ class ComplianceLogger:
             }
         }
         
-        self.audit_logger.info(f"Vendor Registration: {json.dumps(log_entry, indent=2)}")
+        self.audit_logger.info("Vendor Registration", extra={"event": log_entry})
         self.vendor_logger.info(f"New vendor registered: {vendor_data.get('email')} - {vendor_data.get('company_name')}")
 
     def log_vendor_status_change(self, vendor_id: int, old_status: VendorStatus, new_status: VendorStatus, 
@@ -112,7 +304,7 @@ class ComplianceLogger:
             'compliance_impact': self._assess_compliance_impact(old_status, new_status)
         }
         
-        self.audit_logger.info(f"Status Change: {json.dumps(log_entry, indent=2)}")
+        self.audit_logger.info("Status Change", extra={"event": log_entry})
         self.vendor_logger.info(f"Vendor {vendor_id} status changed from {old_status.value} to {new_status.value}")
 
     def log_vendor_approval(self, vendor_id: int, approval_data: Dict[str, Any], user_id: int, ip_address: str = None):
@@ -129,7 +321,7 @@ class ComplianceLogger:
             'risk_assessment': approval_data.get('risk_assessment')
         }
         
-        self.audit_logger.info(f"Vendor Approval: {json.dumps(log_entry, indent=2)}")
+        self.audit_logger.info("Vendor Approval", extra={"event": log_entry})
         self.vendor_logger.info(f"Vendor {vendor_id} approved by user {user_id}")
 
     def log_document_upload(self, vendor_id: int, document_type: str, file_name: str, 
@@ -147,7 +339,7 @@ class ComplianceLogger:
             'compliance_category': self._get_compliance_category(document_type)
         }
         
-        self.audit_logger.info(f"Document Upload: {json.dumps(log_entry, indent=2)}")
+        self.audit_logger.info("Document Upload", extra={"event": log_entry})
         self.vendor_logger.info(f"Document uploaded for vendor {vendor_id}: {document_type} - {file_name}")
 
     def log_user_activity(self, user_id: int, action: str, resource: str, 
@@ -163,7 +355,7 @@ class ComplianceLogger:
             'ip_address': ip_address
         }
         
-        self.audit_logger.info(f"User Activity: {json.dumps(log_entry, indent=2)}")
+        self.audit_logger.info("User Activity", extra={"event": log_entry})
 
     def log_security_event(self, event_type: str, user_id: Optional[int], 
                           ip_address: str, details: Dict[str, Any]):
@@ -177,7 +369,7 @@ class ComplianceLogger:
             'risk_level': self._assess_security_risk(event_type, details)
         }
         
-        self.security_logger.warning(f"Security Event: {json.dumps(log_entry, indent=2)}")
+        self.security_logger.warning("Security Event", extra={"event": log_entry})
 
     def log_compliance_violation(self, vendor_id: int, violation_type: str, 
                                 description: str, severity: str, user_id: int = None):
@@ -193,7 +385,7 @@ class ComplianceLogger:
             'action_required': self._get_required_action(severity)
         }
         
-        self.audit_logger.error(f"Compliance Violation: {json.dumps(log_entry, indent=2)}")
+        self.audit_logger.error("Compliance Violation", extra={"event": log_entry})
         self.error_logger.error(f"Compliance violation for vendor {vendor_id}: {violation_type} - {description}")
 
     def log_system_error(self, error: Exception, context: str, user_id: int = None):
@@ -208,7 +400,7 @@ class ComplianceLogger:
             'stack_trace': traceback.format_exc()
         }
         
-        self.error_logger.error(f"System Error: {json.dumps(log_entry, indent=2)}")
+        self.error_logger.error("System Error", extra={"event": log_entry})
 
     def log_performance_metric(self, operation: str, duration: float, 
                               resource_usage: Dict[str, Any] = None):
@@ -221,7 +413,7 @@ class ComplianceLogger:
             'resource_usage': resource_usage or {}
         }
         
-        self.performance_logger.info(f"Performance: {json.dumps(log_entry, indent=2)}")
+        self.performance_logger.info("Performance", extra={"event": log_entry})
 
     def log_data_access(self, user_id: int, data_type: str, action: str, 
                        record_id: int, ip_address: str = None):
@@ -236,7 +428,7 @@ class ComplianceLogger:
             'ip_address': ip_address
         }
         
-        self.audit_logger.info(f"Data Access: {json.dumps(log_entry, indent=2)}")
+        self.audit_logger.info("Data Access", extra={"event": log_entry})
 
     def log_activity(self, activity_type: str, user_id: Optional[int], 
                     vendor_id: Optional[int], details: Dict[str, Any]):
@@ -249,9 +441,24 @@ class ComplianceLogger:
             'details': details
         }
         
-        self.audit_logger.info(f"Activity: {json.dumps(log_entry, indent=2)}")
+        self.audit_logger.info("Activity", extra={"event": log_entry})
         self.vendor_logger.info(f"Activity {activity_type} for vendor {vendor_id} by user {user_id}")
 
+    def log_bulk_activity(self, activity_type: str, user_id: Optional[int],
+                          entries: List[Dict[str, Any]], details: Dict[str, Any]):
+        """Log one audit record covering a bulk operation on many vendors"""
+        log_entry = {
+            'event_type': activity_type,
+            'timestamp': datetime.utcnow().isoformat(),
+            'user_id': user_id,
+            'vendor_count': len(entries),
+            'details': details,
+            'vendors': entries
+        }
+        
+        self.audit_logger.info("Bulk Activity", extra={"event": log_entry})
+        self.vendor_logger.info(f"Bulk activity {activity_type} for {len(entries)} vendors by user {user_id}")
+
     def _assess_compliance_impact(self, old_status: VendorStatus, new_status: VendorStatus) -> str:
         """Assess the compliance impact of status changes"""
         if new_status == VendorStatus.APPROVED:
@@ -300,4 +507,6 @@ class ComplianceLogger:
 
 
 # Global logger instance
-compliance_logger = ComplianceLogger() 
\ No newline at end of file
+compliance_logger = ComplianceLogger()
+# Scripts never start the writer threads; the app starts them on startup
+atexit.register(compliance_logger.shutdown)
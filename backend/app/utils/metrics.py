@@ -0,0 +1,220 @@
+import bisect
+import threading
+import time
+from typing import Dict, Any, Iterable, List
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket histogram of durations in seconds"""
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, seconds: float):
+        """Record a single duration"""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return cumulative bucket counts, total count and sum"""
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+            total_count = self._count
+
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = total_count
+
+        return {
+            "buckets": cumulative,
+            "count": total_count,
+            "sum": round(total_sum, 6)
+        }
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class LogLinearHistogram:
+    """HDR-style histogram: integer values bucketed with a fixed relative precision
+
+    Values below 2**significant_bits are counted exactly; above that each power
+    of two is split into 2**significant_bits equal sub-buckets, so any reported
+    quantile is within 1 / 2**significant_bits of the true value. Buckets are
+    sparse, so the memory used follows the spread of the data, not its range.
+    Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self, significant_bits: int = 5):
+        self.significant_bits = significant_bits
+        self._sub_buckets = 1 << significant_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_buckets:
+            return value
+        shift = value.bit_length() - 1 - self.significant_bits
+        return (shift + 1) * self._sub_buckets + (value >> shift) - self._sub_buckets
+
+    def _highest_equivalent(self, index: int) -> int:
+        """Largest value that falls in the bucket at index"""
+        if index < self._sub_buckets:
+            return index
+        shift = index // self._sub_buckets - 1
+        lowest = (self._sub_buckets + index % self._sub_buckets) << shift
+        return lowest + (1 << shift) - 1
+
+    def record(self, value: int):
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantiles(self, quantiles: Iterable[float]) -> Dict[float, int]:
+        """Value at or below which each quantile (0-1) of the recorded values falls"""
+        quantiles = sorted(quantiles)
+        results = {}
+        if not self.count:
+            return {q: 0 for q in quantiles}
+        running = 0
+        pending = iter(quantiles)
+        q = next(pending, None)
+        for index in sorted(self.counts):
+            running += self.counts[index]
+            while q is not None and running >= q * self.count:
+                # The bucket bound can overshoot the largest value actually seen
+                results[q] = min(self._highest_equivalent(index), self.max)
+                q = next(pending, None)
+            if q is None:
+                break
+        while q is not None:
+            results[q] = self.max
+            q = next(pending, None)
+        return results
+
+
+class RouteMetrics:
+    """Request count, error count and latency histogram per route, over a window reset by each flush
+
+    Keys are route templates such as 'GET /api/v1/vendors/{vendor_id}', so
+    requests for different IDs share one entry.
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self.window_started = time.time()
+
+    def record(self, route: str, status_code: int, seconds: float):
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {"histogram": LogLinearHistogram(), "errors": 0, "client_errors": 0}
+            stats["histogram"].record(seconds * 1_000_000)  # microseconds
+            if status_code >= 500:
+                stats["errors"] += 1
+            elif status_code >= 400:
+                stats["client_errors"] += 1
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Per-route count, error rates and latency summary in milliseconds"""
+        with self._lock:
+            routes = self._routes
+            if reset:
+                self._routes = {}
+                self.window_started = time.time()
+            summaries = {}
+            for route, stats in sorted(routes.items()):
+                histogram = stats["histogram"]
+                quantiles = histogram.quantiles(self.QUANTILES)
+                summaries[route] = {
+                    "count": histogram.count,
+                    "error_rate": round(stats["errors"] / histogram.count, 4),
+                    "client_error_rate": round(stats["client_errors"] / histogram.count, 4),
+                    "mean_ms": round(histogram.total / histogram.count / 1000, 2),
+                    "p50_ms": round(quantiles[0.5] / 1000, 2),
+                    "p95_ms": round(quantiles[0.95] / 1000, 2),
+                    "p99_ms": round(quantiles[0.99] / 1000, 2),
+                    "max_ms": round(histogram.max / 1000, 2)
+                }
+        return summaries
+
+
+class LabeledCounter:
+    """Family of counters, one per combination of label values"""
+
+    def __init__(self, label_names: Iterable[str]):
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._children: Dict[tuple, Counter] = {}
+
+    def labels(self, *values) -> Counter:
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, Counter())
+        return child
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [{"labels": dict(zip(self.label_names, values)), "value": child.value} for values, child in children]
+
+
+class LabeledHistogram:
+    """Family of LatencyHistograms, one per combination of label values"""
+
+    def __init__(self, label_names: Iterable[str], buckets: Iterable[float] = LatencyHistogram.DEFAULT_BUCKETS):
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._children: Dict[tuple, LatencyHistogram] = {}
+
+    def labels(self, *values) -> LatencyHistogram:
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, LatencyHistogram(self.buckets))
+        return child
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [{"labels": dict(zip(self.label_names, values)), **child.snapshot()} for values, child in children]
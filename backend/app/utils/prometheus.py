@@ -0,0 +1,292 @@
+import copy
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from ..config import settings
+from ..database import get_pool_stats, sql_query_duration
+from .background_jobs import PROCESS_TOKEN, job_events
+from .import_jobs import import_rows
+from .logger import compliance_logger, json_dumps
+from .request_metrics import (
+    http_request_db_queries, http_request_db_seconds, http_request_duration, http_requests
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker development servers only
+    fcntl = None
+
+# Response appends "; charset=utf-8" to text media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+PREFIX = "vms_"
+
+
+def _family(name: str, metric_type: str, help_text: str, samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"name": PREFIX + name, "type": metric_type, "help": help_text, "samples": samples}
+
+
+def _sample(value, **labels) -> Dict[str, Any]:
+    return {"labels": labels, "value": value}
+
+
+def _histogram_sample(snapshot: Dict[str, Any], **labels) -> Dict[str, Any]:
+    return {"labels": labels, **snapshot}
+
+
+def collect() -> Dict[str, Any]:
+    """Snapshot of every metric of this worker process"""
+    pool = get_pool_stats()
+    queues = compliance_logger.queue_stats()
+    metrics = [
+        _family("http_requests_total", "counter", "HTTP requests by method, route template and status",
+                [_sample(s["value"], **s["labels"]) for s in http_requests.snapshot()]),
+        _family("http_request_duration_seconds", "histogram", "HTTP request latency by method and route template",
+                http_request_duration.snapshot()),
+        _family("http_request_db_queries", "histogram", "SQL statements run per HTTP request",
+                http_request_db_queries.snapshot()),
+        _family("http_request_db_seconds", "histogram", "Time spent in SQL statements per HTTP request",
+                http_request_db_seconds.snapshot()),
+        _family("db_query_duration_seconds", "histogram", "SQL statement latency, requests and background jobs",
+                [_histogram_sample(sql_query_duration.snapshot())]),
+        _family("db_pool_size", "gauge", "Connections kept in the pool",
+                [_sample(pool["pool"]["size"])]),
+        _family("db_pool_checked_out", "gauge", "Connections in use",
+                [_sample(pool["pool"]["checked_out"])]),
+        _family("db_pool_overflow", "gauge", "Connections open beyond the pool size",
+                [_sample(pool["pool"]["overflow"])]),
+        _family("db_slots_available", "gauge", "Free database slots for requests",
+                [_sample(pool["db_slots"]["available"])]),
+        _family("db_slots_limit", "gauge", "Database slots for requests",
+                [_sample(pool["db_slots"]["limit"])]),
+        _family("db_pool_checkout_wait_seconds", "histogram", "Time waiting for a pooled connection",
+                [_histogram_sample(pool["checkout_wait_seconds"])]),
+        _family("db_pool_checkout_timeouts_total", "counter", "Connection checkouts that timed out",
+                [_sample(pool["checkout_timeouts"])]),
+        _family("db_slot_wait_seconds", "histogram", "Time requests wait for a database slot",
+                [_histogram_sample(pool["slot_wait_seconds"])]),
+        _family("background_jobs_total", "counter", "Export and import jobs by outcome (submitted, cached, completed, failed)",
+                [_sample(s["value"], **s["labels"]) for s in job_events.snapshot()]),
+        _family("import_rows_total", "counter", "Rows handled by background imports",
+                [_sample(s["value"], **s["labels"]) for s in import_rows.snapshot()]),
+        _family("log_queue_depth", "gauge", "Records waiting in a log category's queue",
+                [_sample(stats["depth"], category=category) for category, stats in queues.items()]),
+        _family("log_queue_capacity", "gauge", "Size of a log category's queue",
+                [_sample(stats["capacity"], category=category) for category, stats in queues.items()]),
+        _family("log_records_dropped_total", "counter", "Log records dropped because the queue was full",
+                [_sample(stats["dropped"], category=category) for category, stats in queues.items()]),
+    ]
+    return {"pid": os.getpid(), "written_at": time.time(), "metrics": metrics}
+
+
+# Snapshot files shared by the worker processes on this host
+
+RETIRED_FILE = "retired.json"
+LOCK_FILE = ".lock"
+
+
+def _snapshot_path(token: str) -> str:
+    return os.path.join(settings.metrics_dir, f"{token}.json")
+
+
+def _write_json(path: str, value: Dict[str, Any]):
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        f.write(json_dumps(value))
+    os.replace(f"{path}.tmp", path)
+
+
+def write_snapshot() -> Dict[str, Any]:
+    """Write this worker's metrics where the other workers can merge them"""
+    snapshot = dict(collect(), token=PROCESS_TOKEN)
+    os.makedirs(settings.metrics_dir, exist_ok=True)
+    _write_json(_snapshot_path(PROCESS_TOKEN), snapshot)
+    return snapshot
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _snapshots_locked():
+    """Serialize reading and retiring snapshots between the worker processes"""
+    with open(os.path.join(settings.metrics_dir, LOCK_FILE), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _as_snapshot_metrics(families: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [dict(family, samples=list(family["samples"].values())) for family in families]
+
+
+def _read_snapshots() -> List[Tuple[Dict[str, Any], bool]]:
+    """(snapshot, alive) of every live worker, plus the retired totals of workers that exited
+
+    An exited worker's counters and histograms are folded into retired.json and
+    its file removed, so merged counters never go down; its gauges are dropped.
+    A worker is gone when its pid no longer exists, or when it has not written a
+    snapshot for metrics_dead_worker_ttl seconds (the pid was reused).
+    """
+    current = write_snapshot()
+    snapshots = [(current, True)]
+    with _snapshots_locked():
+        retired_path = os.path.join(settings.metrics_dir, RETIRED_FILE)
+        retired = _read_json(retired_path) or {"folded": [], "metrics": []}
+        folded = set(retired["folded"])
+        exited = []
+        expired_before = time.time() - settings.metrics_dead_worker_ttl
+        for name in os.listdir(settings.metrics_dir):
+            if not name.endswith(".json") or name in (RETIRED_FILE, f"{PROCESS_TOKEN}.json"):
+                continue
+            path = os.path.join(settings.metrics_dir, name)
+            snapshot = _read_json(path)
+            if snapshot is None:
+                continue
+            if snapshot.get("token") in folded:
+                # Already counted in retired.json; a previous fold stopped before removing it
+                exited.append((path, None))
+            elif _pid_alive(snapshot["pid"]) and snapshot["written_at"] >= expired_before:
+                snapshots.append((snapshot, True))
+            else:
+                exited.append((path, snapshot))
+
+        newly_exited = [snapshot for _, snapshot in exited if snapshot is not None]
+        if newly_exited:
+            retired = {
+                # Tokens whose files are about to be removed; kept only until they are gone
+                "folded": [snapshot.get("token") for snapshot in newly_exited],
+                "metrics": _as_snapshot_metrics(_merge(
+                    [(retired, False)] + [(snapshot, False) for snapshot in newly_exited]
+                ))
+            }
+            _write_json(retired_path, retired)
+        for path, _ in exited:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    snapshots.append((retired, False))
+    return snapshots
+
+
+def _merge(snapshots: List[Tuple[Dict[str, Any], bool]]) -> List[Dict[str, Any]]:
+    """Sum counters and histograms across workers; keep gauges per live worker"""
+    families: Dict[str, Dict[str, Any]] = {}
+    for snapshot, alive in snapshots:
+        for metric in snapshot["metrics"]:
+            family = families.setdefault(
+                metric["name"], {"name": metric["name"], "type": metric["type"], "help": metric["help"], "samples": {}}
+            )
+            samples = family["samples"]
+            for sample in metric["samples"]:
+                labels = sample["labels"]
+                if metric["type"] == "gauge":
+                    # An exited worker's connections and queues are gone
+                    if not alive:
+                        continue
+                    labels = dict(labels, pid=snapshot["pid"])
+                key = tuple(sorted((name, str(value)) for name, value in labels.items()))
+                merged = samples.get(key)
+                if merged is None:
+                    samples[key] = copy.deepcopy(dict(sample, labels=labels))
+                elif metric["type"] == "histogram":
+                    for bound, count in sample["buckets"].items():
+                        merged["buckets"][bound] = merged["buckets"].get(bound, 0) + count
+                    merged["count"] += sample["count"]
+                    merged["sum"] += sample["sum"]
+                else:
+                    merged["value"] += sample["value"]
+    return list(families.values())
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any], **extra) -> str:
+    items = list(labels.items()) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in items) + "}"
+
+
+def _value(value) -> str:
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def render_metrics() -> str:
+    """All workers' metrics in the Prometheus text exposition format"""
+    lines = []
+    for family in _merge(_read_snapshots()):
+        name = family["name"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for sample in family["samples"].values():
+            if family["type"] == "histogram":
+                for bound, count in sample["buckets"].items():
+                    lines.append(f"{name}_bucket{_labels(sample['labels'], le=bound)} {count}")
+                lines.append(f"{name}_sum{_labels(sample['labels'])} {_value(sample['sum'])}")
+                lines.append(f"{name}_count{_labels(sample['labels'])} {sample['count']}")
+            else:
+                lines.append(f"{name}{_labels(sample['labels'])} {_value(sample['value'])}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsSnapshotWriter:
+    """Background thread that writes this worker's snapshot every metrics_snapshot_interval seconds
+
+    Whichever worker serves GET /metrics merges every worker's latest snapshot,
+    so a scrape sees the whole host however the requests were balanced.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(settings.metrics_snapshot_interval):
+            try:
+                write_snapshot()
+            except Exception as e:
+                compliance_logger.log_system_error(e, "Writing metrics snapshot")
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+            self._thread.start()
+            write_snapshot()
+
+    def stop(self):
+        """Stop the thread and write the final counts, which the next scrape folds into the retired totals"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        write_snapshot()
+
+
+metrics_snapshot_writer = MetricsSnapshotWriter()
@@ -0,0 +1,94 @@
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+from starlette.requests import Request
+from ..config import settings
+from .logger import compliance_logger
+from .metrics import LabeledCounter, LabeledHistogram, RouteMetrics
+
+# Per-route request metrics of this worker process, summarised into the performance log
+route_metrics = RouteMetrics()
+
+# Cumulative per-route metrics for /metrics
+http_requests = LabeledCounter(("method", "route", "status"))
+http_request_duration = LabeledHistogram(("method", "route"))
+http_request_db_queries = LabeledHistogram(("method", "route"), buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100, 250))
+http_request_db_seconds = LabeledHistogram(("method", "route"))
+
+
+def route_path(request: Request) -> str:
+    """Path template of the route that handled the request, so IDs in the path don't split metrics"""
+    route = request.scope.get("route")
+    # Unmatched paths (404s, probes) share one entry rather than one per URL
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+def route_template(request: Request) -> str:
+    """'METHOD /path/{param}' of the route that handled the request"""
+    return f"{request.method} {route_path(request)}"
+
+
+def record_request(request: Request, status_code: int, duration: float, queries: Optional[Dict[str, Any]] = None):
+    """Count a finished request, and log it in full for a sample of requests
+
+    queries holds the request's SQL statement count and seconds, if tracked.
+    """
+    path = route_path(request)
+    route = f"{request.method} {path}"
+    route_metrics.record(route, status_code, duration)
+    http_requests.labels(request.method, path, status_code).inc()
+    http_request_duration.labels(request.method, path).observe(duration)
+    if queries is not None:
+        http_request_db_queries.labels(request.method, path).observe(queries["count"])
+        http_request_db_seconds.labels(request.method, path).observe(queries["seconds"])
+    if settings.metrics_raw_sample_rate > 0 and random.random() < settings.metrics_raw_sample_rate:
+        compliance_logger.log_performance_metric(
+            operation=f"{request.method}_{request.url.path}",
+            duration=duration,
+            resource_usage={'status_code': status_code, 'route': route, 'sampled': True}
+        )
+
+
+def flush_route_metrics():
+    """Log one summary per route seen since the previous flush"""
+    window_seconds = round(time.time() - route_metrics.window_started, 1)
+    for route, summary in route_metrics.snapshot(reset=True).items():
+        compliance_logger.performance_logger.info("Route Summary", extra={"event": {
+            "event_type": "ROUTE_METRICS",
+            "route": route,
+            "window_seconds": window_seconds,
+            **summary
+        }})
+
+
+class MetricsFlusher:
+    """Background thread that flushes route summaries every metrics_flush_interval seconds"""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(settings.metrics_flush_interval):
+            try:
+                flush_route_metrics()
+            except Exception as e:
+                compliance_logger.log_system_error(e, "Flushing route metrics")
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the thread and flush what the last interval collected"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        flush_route_metrics()
+
+
+metrics_flusher = MetricsFlusher()
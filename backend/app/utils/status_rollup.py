@@ -0,0 +1,123 @@
+from typing import Dict
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from ..models.status_rollup import StatusRollup
+from .logger import compliance_logger
+
+VENDOR_SCOPE = "vendor"
+APPROVAL_SCOPE = "approval"
+
+# Counter keys as SQL expressions over a vendors / vendor_approvals row
+# (enum columns store member names, e.g. 'UNDER_REVIEW' and 'LEVEL_1:PENDING')
+ROLLUP_KEYS = {
+    VENDOR_SCOPE: ("vendors", "coalesce(CAST({row}.status AS VARCHAR), '')"),
+    APPROVAL_SCOPE: (
+        "vendor_approvals",
+        "coalesce(CAST({row}.level AS VARCHAR), '') || ':' || coalesce(CAST({row}.status AS VARCHAR), '')"
+    ),
+}
+
+
+def _sqlite_bump(scope: str, key_sql: str, delta: int) -> str:
+    return (
+        f"INSERT INTO status_rollups(scope, key, count) VALUES ('{scope}', {key_sql}, {delta}) "
+        f"ON CONFLICT(scope, key) DO UPDATE SET count = count + ({delta});"
+    )
+
+
+def _sqlite_triggers():
+    ddl = []
+    for scope, (table, key) in ROLLUP_KEYS.items():
+        new_key, old_key = key.format(row="new"), key.format(row="old")
+        ddl += [
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_rollup_ai AFTER INSERT ON {table} BEGIN
+                {_sqlite_bump(scope, new_key, 1)}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_rollup_ad AFTER DELETE ON {table} BEGIN
+                {_sqlite_bump(scope, old_key, -1)}
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_rollup_au AFTER UPDATE ON {table}
+            WHEN {old_key} IS NOT {new_key} BEGIN
+                {_sqlite_bump(scope, old_key, -1)}
+                {_sqlite_bump(scope, new_key, 1)}
+            END""",
+        ]
+    return ddl
+
+
+# SQLite: triggers keep the counters in the same transaction as the row change
+SQLITE_ROLLUP_DDL = _sqlite_triggers()
+
+# PostgreSQL installs the equivalent plpgsql triggers in the Alembic migration
+PG_ROLLUP_TRIGGERS = tuple(f"{table}_rollup" for table, _ in ROLLUP_KEYS.values())
+
+# Engines whose counters are trigger-maintained; others fall back to live counts
+_rollup_ready = {}
+
+
+def reconcile_status_rollup(db: Session):
+    """Rebuild every counter from the source tables, in the caller's transaction"""
+    if db.get_bind().dialect.name == "postgresql":
+        # Block trigger updates until the rebuilt counters are committed
+        db.execute(text("LOCK TABLE status_rollups IN EXCLUSIVE MODE"))
+    db.query(StatusRollup).delete(synchronize_session=False)
+    for scope, (table, key) in ROLLUP_KEYS.items():
+        db.execute(text(
+            f"INSERT INTO status_rollups (scope, key, count) "
+            f"SELECT '{scope}', {key.format(row=table)}, count(*) FROM {table} "
+            f"GROUP BY {key.format(row=table)}"
+        ))
+
+
+def ensure_status_rollup(engine: Engine) -> bool:
+    """Install the SQLite counter triggers, or check the PostgreSQL ones, seeding counters on first use"""
+    dialect = engine.dialect.name
+    ready = False
+
+    try:
+        if dialect == "sqlite":
+            with engine.begin() as conn:
+                installed = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'vendors_rollup_ai'")
+                ).first() is not None
+                for ddl in SQLITE_ROLLUP_DDL:
+                    conn.exec_driver_sql(ddl)
+                if not installed:
+                    with Session(bind=conn) as db:
+                        reconcile_status_rollup(db)
+            ready = True
+        elif dialect == "postgresql":
+            with engine.connect() as conn:
+                installed = conn.execute(
+                    text("SELECT count(*) FROM pg_trigger WHERE tgname = ANY(:names)"),
+                    {"names": list(PG_ROLLUP_TRIGGERS)}
+                ).scalar()
+            ready = installed == len(PG_ROLLUP_TRIGGERS)
+            if not ready:
+                compliance_logger.app_logger.warning(
+                    "Status rollup triggers missing (run Alembic migrations), using live status counts"
+                )
+    except DBAPIError as e:
+        compliance_logger.log_system_error(e, "Status rollup unavailable, using live status counts")
+        ready = False
+
+    _rollup_ready[engine] = ready
+    return ready
+
+
+def approval_key(level, status) -> str:
+    """Counter key of the approval scope for an ApprovalLevel and ApprovalStatus"""
+    return f"{level.name}:{status.name}"
+
+
+def get_status_counts(db: Session, scope: str) -> Dict[str, int]:
+    """Counts per key for a rollup scope, read from the counter table when it is maintained"""
+    if _rollup_ready.get(db.get_bind()):
+        rows = db.query(StatusRollup.key, StatusRollup.count).filter(StatusRollup.scope == scope).all()
+    else:
+        table, key = ROLLUP_KEYS[scope]
+        key = key.format(row=table)
+        rows = db.execute(text(f"SELECT {key}, count(*) FROM {table} GROUP BY {key}")).all()
+    return {key: count for key, count in rows}
@@ -0,0 +1,204 @@
+import csv
+import io
+import json
+import itertools
+import os
+import tempfile
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+from sqlalchemy.orm import Query, Session
+from ..models.vendor import Vendor
+
+# Rows fetched per round trip; PostgreSQL streams them from a server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+# Rows inspected to size Excel columns; widths must be known before any row is written
+EXCEL_WIDTH_SAMPLE_SIZE = 200
+EXCEL_MAX_COLUMN_WIDTH = 50
+
+EXCEL_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Columns of the bulk export, in output order
+EXPORT_HEADERS = [
+    "Vendor Code", "Company Name", "Contact Person", "Email", "Phone",
+    "Status", "Supplier Type", "Country", "Category", "MSME Status",
+    "Registration Number", "PAN Number", "GST Number", "Annual Turnover",
+    "Employee Count", "Business Vertical", "Created Date"
+]
+
+EXPORT_COLUMNS = [
+    Vendor.vendor_code, Vendor.company_name, Vendor.contact_person_name, Vendor.email, Vendor.phone_number,
+    Vendor.status, Vendor.supplier_type, Vendor.country_origin, Vendor.supplier_category, Vendor.msme_status,
+    Vendor.registration_number, Vendor.pan_number, Vendor.gst_number, Vendor.annual_turnover,
+    Vendor.employee_count, Vendor.business_vertical, Vendor.created_at
+]
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def export_query(db: Session, vendor_ids: Optional[List[int]] = None, include_id: bool = False) -> Query:
+    """Column-only query of the export fields, in id order, optionally limited to vendor_ids
+
+    include_id adds the vendor id as the first column (used by JSON exports).
+    """
+    columns = [Vendor.id, *EXPORT_COLUMNS] if include_id else EXPORT_COLUMNS
+    query = db.query(*columns)
+    if vendor_ids is not None:
+        query = query.filter(Vendor.id.in_(vendor_ids))
+    return query.order_by(Vendor.id)
+
+
+def format_export_value(value: Any) -> Any:
+    """Render one exported field the way the export files show it"""
+    if value is None:
+        return ""
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def iter_export_rows(query: Query, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[list]:
+    """Yield formatted export rows, fetching batch_size rows at a time"""
+    for row in query.yield_per(batch_size):
+        yield [format_export_value(value) for value in row]
+
+
+def iter_export_records(query: Query, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[dict]:
+    """Yield export rows as JSON-ready dicts keyed by column name, fetching batch_size rows at a time"""
+    for row in query.yield_per(batch_size):
+        record = {}
+        for key, value in row._mapping.items():
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            elif hasattr(value, "value"):
+                value = value.value
+            record[key] = value
+        yield record
+
+
+def stream_ndjson(records: Iterator[dict], batch_size: int = EXPORT_BATCH_SIZE,
+                  on_complete: Optional[Callable[[int, bool], None]] = None) -> Iterator[bytes]:
+    """Encode export records as newline-delimited JSON, yielding one chunk of bytes per batch
+
+    on_complete(sent, completed) is called when the stream ends, also when the
+    client disconnects: sent counts the records in chunks the client took.
+    """
+    lines = []
+    sent = 0
+    completed = False
+
+    try:
+        for record in records:
+            lines.append(json.dumps(record, default=str))
+            if len(lines) == batch_size:
+                yield ("\n".join(lines) + "\n").encode("utf-8")
+                sent += len(lines)
+                lines = []
+
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            sent += len(lines)
+        completed = True
+    finally:
+        if on_complete:
+            on_complete(sent, completed)
+
+
+def stream_csv(rows: Iterator[list], batch_size: int = EXPORT_BATCH_SIZE,
+               on_complete: Optional[Callable[[int, bool], None]] = None) -> Iterator[bytes]:
+    """Encode export rows as CSV, yielding one chunk of bytes per batch of rows
+
+    on_complete(sent, completed) is called when the stream ends, also when the
+    client disconnects: sent counts the data rows in chunks the client took.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADERS)
+    pending = 0
+    sent = 0
+    completed = False
+
+    try:
+        # Send the header before the first batch is fetched
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending == batch_size:
+                yield buffer.getvalue().encode("utf-8")
+                sent += pending
+                pending = 0
+                buffer.seek(0)
+                buffer.truncate(0)
+
+        yield buffer.getvalue().encode("utf-8")
+        sent += pending
+        completed = True
+    finally:
+        if on_complete:
+            on_complete(sent, completed)
+
+
+def estimate_column_widths(rows: Iterable[Sequence[Any]], max_width: int = EXCEL_MAX_COLUMN_WIDTH) -> List[int]:
+    """Excel column widths fitting the longest value of each column in rows, capped at max_width"""
+    widths: List[int] = []
+    for row in rows:
+        for index, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            if index >= len(widths):
+                widths.append(length)
+            elif length > widths[index]:
+                widths[index] = length
+    return [min(width + 2, max_width) for width in widths]
+
+
+def new_excel_tempfile() -> str:
+    """Path of a fresh temporary .xlsx file; the caller removes it"""
+    fd, path = tempfile.mkstemp(suffix=".xlsx", prefix="vendors-export-")
+    os.close(fd)
+    return path
+
+
+def write_excel(rows: Iterator[list], path: str, sheet_title: str = "Vendors Export",
+                sample_size: int = EXCEL_WIDTH_SAMPLE_SIZE) -> int:
+    """Write export rows to an .xlsx file with a write-only workbook, returning the row count
+
+    Rows are written as they are produced, so memory stays flat; column widths
+    are estimated from the header and the first sample_size rows.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+
+    sample = list(itertools.islice(rows, sample_size))
+    for index, width in enumerate(estimate_column_widths([EXPORT_HEADERS, *sample]), 1):
+        ws.column_dimensions[get_column_letter(index)].width = width
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    header = []
+    for title in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        header.append(cell)
+    ws.append(header)
+
+    count = 0
+    for row in itertools.chain(sample, rows):
+        ws.append(row)
+        count += 1
+
+    wb.save(path)
+    return count
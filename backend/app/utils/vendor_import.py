@@ -0,0 +1,273 @@
+import csv
+import io
+import itertools
+import multiprocessing
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.vendor import Vendor, VendorStatus, VendorType
+from ..schemas.vendor import VendorCreate
+
+# Rows validated, de-duplicated and inserted per round trip
+IMPORT_CHUNK_SIZE = 1000
+
+PAN_PATTERN = re.compile(r"^[A-Z]{5}[0-9]{4}[A-Z]$")
+# State code, the holder's PAN, entity number, 'Z', checksum character
+GST_PATTERN = re.compile(r"^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z][1-9A-Z]Z[0-9A-Z]$")
+
+
+def parse_vendor_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one import row (keyed by the export column titles) to Vendor column values"""
+    supplier_type = (row.get("Supplier Type") or "").strip()
+    return {
+        "company_name": row.get("Company Name", ""),
+        "contact_person_name": row.get("Contact Person", ""),
+        "email": row.get("Email", ""),
+        "phone_number": row.get("Phone", ""),
+        "supplier_type": VendorType(supplier_type.lower()) if supplier_type else None,
+        "country_origin": row.get("Country") or "IN",
+        "supplier_category": row.get("Category", ""),
+        "registration_number": row.get("Registration Number", ""),
+        "pan_number": row.get("PAN Number", ""),
+        "gst_number": row.get("GST Number", ""),
+        "annual_turnover": int(row.get("Annual Turnover", 0)) if row.get("Annual Turnover") else None,
+        "employee_count": str(int(row.get("Employee Count", 0))) if row.get("Employee Count") else None,
+        "business_vertical": row.get("Business Vertical", ""),
+        "status": VendorStatus.PENDING
+    }
+
+
+def validate_vendor_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse one import row and check it the way vendor registration would, raising ValueError if invalid"""
+    vendor_data = parse_vendor_row(row)
+    try:
+        VendorCreate.model_validate(vendor_data)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        ))
+
+    pan_number = (vendor_data["pan_number"] or "").strip().upper()
+    gst_number = (vendor_data["gst_number"] or "").strip().upper()
+    if pan_number and not PAN_PATTERN.match(pan_number):
+        raise ValueError(f"Invalid PAN number {vendor_data['pan_number']}")
+    if gst_number and not GST_PATTERN.match(gst_number):
+        raise ValueError(f"Invalid GST number {vendor_data['gst_number']}")
+    if pan_number and gst_number and gst_number[2:12] != pan_number:
+        raise ValueError(f"GST number {vendor_data['gst_number']} does not belong to PAN {vendor_data['pan_number']}")
+    return vendor_data
+
+
+def validate_vendor_chunk(rows: List[Dict[str, Any]]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """(vendor values, None) or (None, error) for each row, in order; runs in pool workers"""
+    results = []
+    for row in rows:
+        try:
+            results.append((validate_vendor_row(row), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+_validation_pool: Optional[ProcessPoolExecutor] = None
+_validation_pool_lock = threading.Lock()
+
+
+def validation_workers() -> int:
+    """Validation processes of this web worker; by default the host's CPUs are split between web workers"""
+    if settings.import_validation_workers:
+        return settings.import_validation_workers
+    return max((os.cpu_count() or 1) // max(settings.web_concurrency, 1), 1)
+
+
+def validation_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for row validation, or None when validating in the importing thread"""
+    global _validation_pool
+    if validation_workers() <= 1:
+        return None
+    with _validation_pool_lock:
+        if _validation_pool is None:
+            # Fresh interpreters rather than forks of a threaded server holding DB connections
+            _validation_pool = ProcessPoolExecutor(
+                max_workers=validation_workers(), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _validation_pool
+
+
+def warm_validation_pool():
+    """Start the pool's processes now, so the first import doesn't wait for interpreters to spawn"""
+    executor = validation_pool()
+    if executor is not None:
+        # Each empty task makes the executor spawn one more process, which imports this module
+        for _ in range(validation_workers()):
+            executor.submit(validate_vendor_chunk, [])
+
+
+def shutdown_validation_pool():
+    """Stop the validation pool; the next import starts a new one"""
+    global _validation_pool
+    with _validation_pool_lock:
+        if _validation_pool is not None:
+            _validation_pool.shutdown(wait=False, cancel_futures=True)
+            _validation_pool = None
+
+
+def validate_chunks(chunks: Iterator[List[Tuple[int, Dict[str, Any]]]], executor: Optional[Executor], workers: int = 1):
+    """Yield (chunk, validation results) for each chunk of (row number, row) pairs, in input order
+
+    With an executor of `workers` processes, up to two chunks per worker are
+    validated ahead of the consumer while it inserts earlier ones. A file that
+    fits in a single chunk is validated inline, as shipping it to the pool
+    would cost more than it saves.
+    """
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if executor is None or second is None:
+        for chunk in itertools.chain([first], [second] if second else [], chunks):
+            yield chunk, validate_vendor_chunk([row for _, row in chunk])
+        return
+
+    max_pending = 2 * workers
+    pending = deque()
+    try:
+        for chunk in itertools.chain([first, second], chunks):
+            pending.append((chunk, executor.submit(validate_vendor_chunk, [row for _, row in chunk])))
+            if len(pending) >= max_pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next import
+        if executor is _validation_pool:
+            shutdown_validation_pool()
+        raise
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (row number, row) from an uploaded CSV file, decoding it incrementally"""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        # Row numbers start at 2 to account for the header
+        for row_num, row in enumerate(csv.DictReader(text), 2):
+            yield row_num, row
+    finally:
+        # Leave the upload itself open for its owner to close
+        if not text.closed:
+            text.detach()
+
+
+def iter_excel_rows(file: BinaryIO, read_only: bool = True) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (row number, row) from the active sheet of an uploaded workbook
+
+    read_only streams the sheet XML instead of building every cell in memory;
+    blank rows (common at the end of read-only sheets) are skipped.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=read_only, data_only=True)
+    try:
+        sheet_rows = wb.active.iter_rows(values_only=True)
+        headers = next(sheet_rows, None)
+        if headers is None:
+            return
+        for row_num, values in enumerate(sheet_rows, 2):
+            if all(value is None for value in values):
+                continue
+            yield row_num, {
+                header: str(value) if value is not None else ""
+                for header, value in zip(headers, values)
+            }
+    finally:
+        # Read-only workbooks keep the zip archive open until closed
+        wb.close()
+
+
+def assign_vendor_codes(db: Session, mappings: List[Dict[str, Any]], generate_code: Callable[[], str], used_codes: set):
+    """Give each new vendor a code unused by this import and by existing vendors
+
+    Short random codes collide often across tens of thousands of rows, so
+    collisions are regenerated instead of failing the whole INSERT.
+    """
+    pending = mappings
+    while pending:
+        for vendor_data in pending:
+            code = generate_code()
+            while code in used_codes:
+                code = generate_code()
+            used_codes.add(code)
+            vendor_data["vendor_code"] = code
+        codes = [vendor_data["vendor_code"] for vendor_data in pending]
+        taken = set(db.execute(select(Vendor.vendor_code).where(Vendor.vendor_code.in_(codes))).scalars())
+        pending = [vendor_data for vendor_data in pending if vendor_data["vendor_code"] in taken]
+
+
+def import_vendor_chunks(db: Session, rows: Iterable[Tuple[int, Dict[str, Any]]], generate_code: Callable[[], str],
+                         chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[Tuple[int, int, List[Tuple[int, Dict[str, Any], str]]]]:
+    """Insert vendors from (row number, row) pairs chunk by chunk, without committing
+
+    Rows are validated on the shared process pool; each chunk then costs one
+    query for existing emails and one multi-row INSERT. After each chunk yields
+    (rows read, rows imported, rejected rows), where a rejected row is
+    (row number, row, error); callers may commit in between.
+    """
+    seen_emails = set()
+    used_codes = set()
+    rows = iter(rows)
+    chunks = iter(lambda: list(itertools.islice(rows, chunk_size)), [])
+
+    for chunk, results in validate_chunks(chunks, validation_pool(), validation_workers()):
+        rejected = []
+        parsed = []
+        for (row_num, row), (vendor_data, error) in zip(chunk, results):
+            if error is not None:
+                rejected.append((row_num, row, error))
+            else:
+                parsed.append((row_num, row, vendor_data))
+
+        emails = {vendor_data["email"] for _, _, vendor_data in parsed}
+        existing = set(db.execute(select(Vendor.email).where(Vendor.email.in_(emails))).scalars()) if emails else set()
+
+        mappings = []
+        for row_num, row, vendor_data in parsed:
+            email = vendor_data["email"]
+            if email in existing or email in seen_emails:
+                rejected.append((row_num, row, f"Vendor with email {email} already exists"))
+                continue
+            seen_emails.add(email)
+            mappings.append(vendor_data)
+
+        if mappings:
+            assign_vendor_codes(db, mappings, generate_code, used_codes)
+            db.execute(insert(Vendor), mappings)
+
+        rejected.sort(key=lambda rejection: rejection[0])
+        yield len(chunk), len(mappings), rejected
+
+
+def import_vendor_rows(db: Session, rows: Iterable[Tuple[int, Dict[str, Any]]], generate_code: Callable[[], str],
+                       chunk_size: int = IMPORT_CHUNK_SIZE) -> Tuple[int, List[Dict[str, Any]]]:
+    """Insert all vendors from (row number, row) pairs, without committing
+
+    Returns the imported count and the rows that failed, with their errors.
+    """
+    imported_count = 0
+    failed_rows = []
+    for _, imported, rejected in import_vendor_chunks(db, rows, generate_code, chunk_size):
+        imported_count += imported
+        failed_rows.extend({"row": row_num, "error": error} for row_num, _, error in rejected)
+    return imported_count, failed_rows
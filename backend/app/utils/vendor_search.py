@@ -0,0 +1,168 @@
+import re
+from typing import List, Tuple, Any
+from sqlalchemy import text, case, func, literal_column, or_, bindparam, Integer, Float
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Query, Session
+from ..models.vendor import Vendor
+from .logger import compliance_logger
+
+# Columns covered by vendor search, in ranking priority order
+SEARCH_COLUMNS = ("company_name", "contact_person_name", "email", "vendor_code")
+
+# PostgreSQL: the tsvector expression index (see the Alembic migration) is only
+# used when the query repeats this expression exactly
+PG_SEARCH_DOCUMENT = (
+    "to_tsvector('simple', "
+    + " || ' ' || ".join(f"coalesce(vendors.{column}, '')" for column in SEARCH_COLUMNS)
+    + ")"
+)
+
+# SQLite: an external-content FTS5 table with the trigram tokenizer gives
+# indexed, case-insensitive substring matching; triggers keep it in sync
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS vendor_search USING fts5("
+    f"{', '.join(SEARCH_COLUMNS)}, content='vendors', content_rowid='id', tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS vendor_search_ai AFTER INSERT ON vendors BEGIN
+        INSERT INTO vendor_search(rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES (new.id, {', '.join(f'new.{c}' for c in SEARCH_COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS vendor_search_ad AFTER DELETE ON vendors BEGIN
+        INSERT INTO vendor_search(vendor_search, rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.id, {', '.join(f'old.{c}' for c in SEARCH_COLUMNS)});
+    END""",
+    # Only edits of searched columns touch the index, not status changes or approvals
+    f"""CREATE TRIGGER IF NOT EXISTS vendor_search_au AFTER UPDATE OF {', '.join(SEARCH_COLUMNS)} ON vendors BEGIN
+        INSERT INTO vendor_search(vendor_search, rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.id, {', '.join(f'old.{c}' for c in SEARCH_COLUMNS)});
+        INSERT INTO vendor_search(rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES (new.id, {', '.join(f'new.{c}' for c in SEARCH_COLUMNS)});
+    END""",
+]
+
+# The trigram tokenizer cannot match terms shorter than three characters
+SQLITE_MIN_TRIGRAM_LENGTH = 3
+
+# Detected backend per engine: 'postgresql_trgm', 'postgresql', 'sqlite_fts5' or 'like'
+_search_backends = {}
+
+
+def ensure_search_index(engine: Engine) -> str:
+    """Detect the search backend for an engine, creating the SQLite FTS index if needed"""
+    dialect = engine.dialect.name
+    backend = "like"
+
+    try:
+        if dialect == "postgresql":
+            # pg_trgm and the GIN indexes are installed by the Alembic migration
+            with engine.connect() as conn:
+                has_trgm = conn.execute(
+                    text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                ).first() is not None
+            backend = "postgresql_trgm" if has_trgm else "postgresql"
+        elif dialect == "sqlite":
+            with engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'vendor_search'")
+                ).first() is not None
+                update_trigger = conn.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'vendor_search_au'")
+                ).scalar()
+                if update_trigger and "UPDATE OF" not in update_trigger:
+                    # Created before it was limited to the searched columns
+                    conn.exec_driver_sql("DROP TRIGGER vendor_search_au")
+                for ddl in SQLITE_FTS_DDL:
+                    conn.exec_driver_sql(ddl)
+                if not exists:
+                    # Index vendors that were created before the search table existed
+                    conn.exec_driver_sql("INSERT INTO vendor_search(vendor_search) VALUES ('rebuild')")
+            backend = "sqlite_fts5"
+    except DBAPIError as e:
+        # FTS5 not compiled in, or the catalog is not readable: fall back to LIKE scans
+        compliance_logger.log_system_error(e, "Vendor search index unavailable, falling back to LIKE scans")
+        backend = "like"
+
+    _search_backends[engine] = backend
+    return backend
+
+
+def get_search_backend(db: Session) -> str:
+    """Return the search backend for the session's engine, detecting it on first use"""
+    engine = db.get_bind()
+    if engine not in _search_backends:
+        ensure_search_index(engine)
+    return _search_backends[engine]
+
+
+# Escape character for LIKE patterns; '/' needs no quoting in any dialect's literals
+LIKE_ESCAPE = "/"
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally"""
+    return term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+
+
+def _like_filter(term: str):
+    pattern = f"%{escape_like(term)}%"
+    return or_(*[getattr(Vendor, column).ilike(pattern, escape=LIKE_ESCAPE) for column in SEARCH_COLUMNS])
+
+
+def _prefix_boost(term: str):
+    """0 for vendors whose company name starts with the term, 1 otherwise"""
+    return case(
+        (Vendor.company_name.ilike(f"{escape_like(term)}%", escape=LIKE_ESCAPE), 0),
+        else_=1
+    )
+
+
+def apply_vendor_search(query: Query, db: Session, search: str) -> Tuple[Query, List[Any]]:
+    """
+    Filter a Vendor query by a free-text search term.
+
+    Returns the filtered query and the ORDER BY clauses that rank the results:
+    company-name prefix matches first, then text relevance.
+    """
+    term = search.strip()
+    if not term:
+        return query, []
+
+    backend = get_search_backend(db)
+
+    if backend.startswith("postgresql"):
+        document = literal_column(PG_SEARCH_DOCUMENT)
+        tokens = re.findall(r"\w+", term.lower())
+        rank = None
+        conditions = [_like_filter(term)]  # trigram GIN indexes serve these ILIKEs
+        if tokens:
+            tsquery = func.to_tsquery(
+                literal_column("'simple'"),
+                bindparam("search_tsquery", " & ".join(f"{token}:*" for token in tokens))
+            )
+            conditions.append(document.op("@@")(tsquery))
+            rank = func.ts_rank(document, tsquery)
+        if backend == "postgresql_trgm":
+            similarity = func.similarity(Vendor.company_name, term)
+            rank = similarity if rank is None else rank + similarity
+
+        query = query.filter(or_(*conditions))
+        order_by = [_prefix_boost(term)]
+        if rank is not None:
+            order_by.append(rank.desc())
+        return query, order_by
+
+    if backend == "sqlite_fts5" and len(term) >= SQLITE_MIN_TRIGRAM_LENGTH:
+        hits = (
+            text(
+                "SELECT rowid AS vendor_id, bm25(vendor_search) AS rank "
+                "FROM vendor_search WHERE vendor_search MATCH :search_match"
+            )
+            .bindparams(search_match='"' + term.replace('"', '""') + '"')
+            .columns(vendor_id=Integer, rank=Float)
+            .subquery("search_hits")
+        )
+        query = query.join(hits, hits.c.vendor_id == Vendor.id)
+        # bm25() is lower for better matches
+        return query, [_prefix_boost(term), hits.c.rank.asc()]
+
+    return query.filter(_like_filter(term)), [_prefix_boost(term)]
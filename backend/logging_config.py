@@ -7,6 +7,16 @@ This configuration ensures all activities are logged for compliance, audit, and
 import os
 import logging.config
 from datetime import datetime
+from app.utils.log_policy import (
+    LOG_CATEGORIES, CATEGORY_RETENTION_DAYS, COMPLIANCE_CATEGORIES, MANUFACTURING_COMPLIANCE_REQUIREMENTS
+)
+from app.utils.log_rotation import CompressingRotatingFileHandler
+
+# Handler name prefix of each category's file handler
+CATEGORY_HANDLER_NAMES = {
+    'app': 'application', 'audit': 'audit', 'security': 'security',
+    'vendor': 'vendor', 'performance': 'performance', 'error': 'error'
+}
 
 # Create logs directory
 os.makedirs('logs', exist_ok=True)
@@ -32,66 +42,6 @@ LOGGING_CONFIG = {
     },
     
     'handlers': {
-        # Application logs - general application activity
-        'application_file': {
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': 'logs/application.log',
-            'maxBytes': 10485760,  # 10MB
-            'backupCount': 5,
-            'formatter': 'detailed',
-            'encoding': 'utf-8'
-        },
-        
-        # Audit trail - compliance and regulatory requirements
-        'audit_file': {
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': 'logs/audit_trail.log',
-            'maxBytes': 10485760,  # 10MB
-            'backupCount': 10,  # Keep more audit logs
-            'formatter': 'detailed',
-            'encoding': 'utf-8'
-        },
-        
-        # Security events - security monitoring
-        'security_file': {
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': 'logs/security.log',
-            'maxBytes': 10485760,  # 10MB
-            'backupCount': 10,
-            'formatter': 'detailed',
-            'encoding': 'utf-8'
-        },
-        
-        # Vendor activity - vendor-specific actions
-        'vendor_file': {
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': 'logs/vendor_activity.log',
-            'maxBytes': 10485760,  # 10MB
-            'backupCount': 5,
-            'formatter': 'detailed',
-            'encoding': 'utf-8'
-        },
-        
-        # Performance metrics - system performance monitoring
-        'performance_file': {
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': 'logs/performance.log',
-            'maxBytes': 10485760,  # 10MB
-            'backupCount': 3,
-            'formatter': 'detailed',
-            'encoding': 'utf-8'
-        },
-        
-        # Error logs - system errors and exceptions
-        'error_file': {
-            'class': 'logging.handlers.RotatingFileHandler',
-            'filename': 'logs/errors.log',
-            'maxBytes': 10485760,  # 10MB
-            'backupCount': 5,
-            'formatter': 'detailed',
-            'encoding': 'utf-8'
-        },
-        
         # Console output for development
         'console': {
             'class': 'logging.StreamHandler',
@@ -99,14 +49,28 @@ LOGGING_CONFIG = {
             'level': 'INFO'
         },
         
-        # Compliance reports - structured JSON for compliance reporting
+        # Compliance reports - structured JSON for compliance reporting, kept as long as the audit trail
         'compliance_json': {
-            'class': 'logging.handlers.RotatingFileHandler',
+            '()': CompressingRotatingFileHandler,
             'filename': 'logs/compliance_reports.json',
-            'maxBytes': 10485760,  # 10MB
-            'backupCount': 5,
-            'formatter': 'json',
-            'encoding': 'utf-8'
+            'max_bytes': 10485760,  # 10MB
+            'backup_count': 5,
+            'retention_days': CATEGORY_RETENTION_DAYS['audit'],
+            'formatter': 'json'
+        },
+        
+        # One rotated, compressed file per category, with the same policy as ComplianceLogger:
+        # application_file, audit_file, security_file, vendor_file, performance_file, error_file
+        **{
+            f"{CATEGORY_HANDLER_NAMES[name]}_file": {
+                '()': CompressingRotatingFileHandler,
+                'filename': policy['filename'],
+                'max_bytes': policy['max_bytes'],
+                'backup_count': policy['backup_count'],
+                'retention_days': CATEGORY_RETENTION_DAYS[name],
+                'formatter': 'detailed'
+            }
+            for name, policy in LOG_CATEGORIES.items()
         }
     },
     
@@ -167,50 +131,6 @@ LOGGING_CONFIG = {
     }
 }
 
-# Compliance-specific logging categories
-COMPLIANCE_CATEGORIES = {
-    'VENDOR_REGISTRATION': {
-        'description': 'Vendor registration activities',
-        'retention_days': 2555,  # 7 years
-        'critical': True
-    },
-    'VENDOR_STATUS_CHANGE': {
-        'description': 'Vendor status modifications',
-        'retention_days': 2555,  # 7 years
-        'critical': True
-    },
-    'DOCUMENT_UPLOAD': {
-        'description': 'Document upload activities',
-        'retention_days': 2555,  # 7 years
-        'critical': True
-    },
-    'COMPLIANCE_VIOLATION': {
-        'description': 'Compliance violations and issues',
-        'retention_days': 3650,  # 10 years
-        'critical': True
-    },
-    'SECURITY_EVENT': {
-        'description': 'Security-related events',
-        'retention_days': 1825,  # 5 years
-        'critical': True
-    },
-    'USER_ACTIVITY': {
-        'description': 'User activity tracking',
-        'retention_days': 1095,  # 3 years
-        'critical': False
-    },
-    'DATA_ACCESS': {
-        'description': 'Data access and retrieval',
-        'retention_days': 1095,  # 3 years
-        'critical': False
-    },
-    'PERFORMANCE_METRIC': {
-        'description': 'System performance metrics',
-        'retention_days': 365,  # 1 year
-        'critical': False
-    }
-}
-
 # Risk levels for compliance events
 RISK_LEVELS = {
     'CRITICAL': {
@@ -235,57 +155,6 @@ RISK_LEVELS = {
     }
 }
 
-# Manufacturing compliance requirements
-MANUFACTURING_COMPLIANCE_REQUIREMENTS = {
-    'ISO_9001': {
-        'description': 'Quality Management System',
-        'logging_requirements': [
-            'VENDOR_REGISTRATION',
-            'VENDOR_STATUS_CHANGE',
-            'DOCUMENT_UPLOAD',
-            'COMPLIANCE_VIOLATION'
-        ],
-        'retention_period': '7 years'
-    },
-    'ISO_14001': {
-        'description': 'Environmental Management System',
-        'logging_requirements': [
-            'VENDOR_REGISTRATION',
-            'COMPLIANCE_VIOLATION'
-        ],
-        'retention_period': '7 years'
-    },
-    'ISO_45001': {
-        'description': 'Occupational Health and Safety',
-        'logging_requirements': [
-            'VENDOR_REGISTRATION',
-            'COMPLIANCE_VIOLATION',
-            'SECURITY_EVENT'
-        ],
-        'retention_period': '7 years'
-    },
-    'FDA_21_CFR_PART_11': {
-        'description': 'Electronic Records and Signatures',
-        'logging_requirements': [
-            'VENDOR_REGISTRATION',
-            'VENDOR_STATUS_CHANGE',
-            'DOCUMENT_UPLOAD',
-            'USER_ACTIVITY',
-            'DATA_ACCESS'
-        ],
-        'retention_period': '10 years'
-    },
-    'GDPR': {
-        'description': 'General Data Protection Regulation',
-        'logging_requirements': [
-            'USER_ACTIVITY',
-            'DATA_ACCESS',
-            'SECURITY_EVENT'
-        ],
-        'retention_period': '3 years'
-    }
-}
-
 def setup_logging():
     """Initialize the logging configuration"""
     logging.config.dictConfig(LOGGING_CONFIG)
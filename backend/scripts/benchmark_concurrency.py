@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the API execution model
+
+Fires a burst of parallel requests at GET /api/v1/vendors/ while one request
+in the burst is forced to run a slow query. Because blocking handlers run on
+the threadpool, the p99 latency of the fast requests should stay flat as the
+slow query gets slower instead of growing with it.
+
+Usage:
+    python scripts/benchmark_concurrency.py [--requests 200] [--slow 0.25 0.5 1 2]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SLOW_MARKER = "__benchmark_slow_query__"
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_burst(app, total_requests: int):
+    """Send one burst of concurrent requests; the first one carries the slow marker"""
+    import httpx
+
+    async def timed_get(client, params):
+        start = time.perf_counter()
+        response = await client.get("/api/v1/vendors/", params=params)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    async with httpx.AsyncClient(app=app, base_url="http://localhost") as client:
+        tasks = [timed_get(client, {"search": SLOW_MARKER})]
+        tasks += [timed_get(client, {"limit": 25}) for _ in range(total_requests - 1)]
+        durations = await asyncio.gather(*tasks)
+
+    return durations[0], durations[1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="parallel requests per burst")
+    parser.add_argument("--slow", type=float, nargs="+", default=[0.25, 0.5, 1.0, 2.0],
+                        help="slow query durations to test, in seconds")
+    parser.add_argument("--database-url", default=None,
+                        help="database to benchmark against (defaults to a temporary SQLite file)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+
+    import anyio.to_thread
+    from sqlalchemy import event
+    from app.config import settings
+    from app.database import engine
+    from app.main import app
+
+    state = {"slow_seconds": 0.0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def inject_slow_query(conn, cursor, statement, parameters, context, executemany):
+        if parameters and any(SLOW_MARKER in str(value) for value in
+                              (parameters.values() if isinstance(parameters, dict) else parameters)):
+            time.sleep(state["slow_seconds"])
+
+    async def run_all():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_pool_size
+        # Warm up the connection pool and import paths
+        await run_burst(app, min(args.requests, 20))
+
+        print(f"{'slow query (s)':>15} {'slow req (s)':>13} {'fast p50 (ms)':>14} {'fast p99 (ms)':>14}")
+        for slow_seconds in args.slow:
+            state["slow_seconds"] = slow_seconds
+            slow_duration, fast_durations = await run_burst(app, args.requests)
+            print(f"{slow_seconds:>15.2f} {slow_duration:>13.2f} "
+                  f"{statistics.median(fast_durations) * 1000:>14.1f} "
+                  f"{percentile(fast_durations, 99) * 1000:>14.1f}")
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Excel import parsing benchmark
+
+Writes a synthetic vendor workbook (50k rows by default) and parses it with each
+of the import strategies, every one in a fresh process so peak memory is
+measured separately:
+
+    legacy     load_workbook() in full mode, one ws.cell() lookup per cell
+               (what POST /vendors/bulk/import did before)
+    full       full-mode workbook read with iter_rows(values_only=True)
+    read_only  read_only=True with iter_rows(values_only=True), as the import uses now
+
+Only the parsing is timed; validation and the chunked INSERTs are shared with the
+CSV path and covered by scripts/benchmark_import.py.
+
+Usage:
+    python scripts/benchmark_excel_import.py [--rows 50000] [--modes legacy full read_only]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_import import CSV_HEADERS, peak_rss_mb, vendor_rows
+
+MODES = ["legacy", "full", "read_only"]
+
+
+def write_workbook(path: str, size: int):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Vendors")
+    ws.append(CSV_HEADERS)
+    for row in vendor_rows(size, existing=0):
+        # Store the numeric columns as numbers, like a hand-made sheet would
+        row[10] = int(row[10])
+        row[11] = int(row[11])
+        ws.append(row)
+    wb.save(path)
+
+
+def legacy_rows(path: str):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path)
+    ws = wb.active
+    headers = [cell.value for cell in ws[1]]
+    for row_num in range(2, ws.max_row + 1):
+        row_data = {}
+        for col, header in enumerate(headers, 1):
+            cell_value = ws.cell(row=row_num, column=col).value
+            row_data[header] = str(cell_value) if cell_value is not None else ""
+        yield row_num, row_data
+
+
+def measure(mode: str, path: str):
+    """Parse the workbook once in this process and print the result as JSON"""
+    from app.utils.vendor_import import iter_excel_rows
+
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        rows = legacy_rows(path) if mode == "legacy" else iter_excel_rows(f, read_only=(mode == "read_only"))
+        count = sum(1 for _ in rows)
+    print(json.dumps({"rows": count, "seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="data rows in the generated workbook")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="strategies to compare")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    path = os.path.join(tempfile.mkdtemp(), f"vendors_{args.rows}.xlsx")
+    write_workbook(path, args.rows)
+    print(f"Workbook: {args.rows:,} rows, {os.path.getsize(path) / (1024 * 1024):.1f}MB")
+    print(f"{'mode':>10} {'seconds':>8} {'rows/s':>9} {'peak RSS':>9}")
+
+    for mode in args.modes:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure", mode, path],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:>10} {result['seconds']:>8.2f} {result['rows'] / result['seconds']:>9.0f} "
+              f"{result['peak_rss_mb']:>7.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
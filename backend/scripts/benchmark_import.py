@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Vendor bulk import benchmark
+
+Generates synthetic vendor CSV files (10k and 100k rows by default), posts each
+one to POST /api/v1/vendors/bulk/import against a scratch database that already
+holds some vendors, and reports throughput and peak memory of the process.
+About 1% of the rows reuse an existing email, so the duplicate check is exercised.
+
+Usage:
+    python scripts/benchmark_import.py [--sizes 10000 100000] [--existing 50000]
+    python scripts/benchmark_import.py --database-url postgresql://.../scratch_db
+
+WARNING: with --database-url the vendors table of that database is emptied.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CSV_HEADERS = [
+    "Company Name", "Contact Person", "Email", "Phone", "Supplier Type", "Country", "Category",
+    "Registration Number", "PAN Number", "GST Number", "Annual Turnover", "Employee Count", "Business Vertical"
+]
+
+
+def vendor_rows(size: int, existing: int):
+    for i in range(size):
+        # Every hundredth row collides with a preloaded vendor
+        email = f"existing{i % existing}@example.com" if existing and i % 100 == 0 else f"import{i}@example.com"
+        yield [
+            f"Import Vendor {i}", "Priya Sharma", email, "+919876543210", "manufacturer", "IN", "Castings",
+            f"REG{i:08d}", "ABCDE1234F", "27ABCDE1234F1Z5", str(1000000 + i), "50", "manufacturing"
+        ]
+
+
+def write_csv(path: str, size: int, existing: int):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS)
+        writer.writerows(vendor_rows(size, existing))
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="CSV row counts to import")
+    parser.add_argument("--existing", type=int, default=50000, help="vendors preloaded before each import")
+    parser.add_argument("--database-url", default=None,
+                        help="scratch database to use (defaults to a temporary SQLite file)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'import.db')}"
+    # Keep the request logs out of the measurement (and out of the repo's log files)
+    os.chdir(workdir)
+    logging.disable(logging.CRITICAL)
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import engine
+    from app.models.vendor import Vendor
+
+    client = TestClient(app, base_url="http://localhost")
+    print(f"Importing into {engine.dialect.name}, {args.existing:,} existing vendors")
+    print(f"{'rows':>8} {'seconds':>8} {'rows/s':>9} {'imported':>9} {'failed':>7} {'peak RSS':>9}")
+
+    for size in args.sizes:
+        with engine.begin() as conn:
+            conn.execute(Vendor.__table__.delete())
+            conn.execute(Vendor.__table__.insert(), [
+                {
+                    "vendor_code": f"EX{i:08d}", "business_vertical": "manufacturing",
+                    "company_name": f"Existing {i}", "country_origin": "IN", "contact_person_name": "A",
+                    "email": f"existing{i}@example.com", "phone_number": "1", "status": "PENDING",
+                    "msme_status": "PENDING"
+                }
+                for i in range(args.existing)
+            ])
+
+        path = os.path.join(workdir, f"vendors_{size}.csv")
+        write_csv(path, size, args.existing)
+
+        with open(path, "rb") as f:
+            start = time.perf_counter()
+            response = client.post("/api/v1/vendors/bulk/import", files={"file": ("vendors.csv", f, "text/csv")})
+            seconds = time.perf_counter() - start
+        result = response.json()
+        if response.status_code != 200:
+            print(f"{size:>8} failed: {result}")
+            continue
+        print(f"{size:>8} {seconds:>8.2f} {size / seconds:>9.0f} {result['imported_count']:>9} "
+              f"{result['failed_count']:>7} {peak_rss_mb():>7.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Bulk import validation scaling benchmark
+
+Builds synthetic import rows in memory and runs them through the import's row
+validation (field mapping, VendorCreate, PAN/GST checks) in IMPORT_CHUNK_SIZE
+chunks, first in-process and then on process pools of increasing size, and
+reports throughput and speedup. Pools are warmed up before timing, as the app
+keeps its pool alive between imports. No database is touched.
+
+Usage:
+    python scripts/benchmark_import_validation.py [--rows 200000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_import import CSV_HEADERS, vendor_rows
+
+
+def default_workers():
+    counts = [1]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+    if counts[-1] != (os.cpu_count() or 1):
+        counts.append(os.cpu_count())
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000, help="rows to validate")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers(),
+                        help="pool sizes to compare (1 validates in-process)")
+    args = parser.parse_args()
+
+    # Importing the app creates (but never connects) an engine; keep it off real databases
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'unused.db')}"
+    from app.utils.vendor_import import IMPORT_CHUNK_SIZE, validate_chunks, validate_vendor_chunk
+
+    rows = [(row_num, dict(zip(CSV_HEADERS, values))) for row_num, values in enumerate(vendor_rows(args.rows, 0), 2)]
+    chunks = [rows[i:i + IMPORT_CHUNK_SIZE] for i in range(0, len(rows), IMPORT_CHUNK_SIZE)]
+
+    print(f"Validating {args.rows:,} rows on {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'seconds':>8} {'rows/s':>9} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            list(executor.map(validate_vendor_chunk, [[]] * workers))
+        try:
+            start = time.perf_counter()
+            validated = sum(
+                sum(1 for _, error in results if error is None)
+                for _, results in validate_chunks(iter(chunks), executor, workers)
+            )
+            seconds = time.perf_counter() - start
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        if validated != args.rows:
+            print(f"{workers:>7} only {validated} of {args.rows} rows were valid")
+        baseline = baseline or seconds
+        print(f"{workers:>7} {seconds:>8.2f} {args.rows / seconds:>9.0f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
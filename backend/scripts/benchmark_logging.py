@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Structured log encoding benchmark
+
+Formats representative ComplianceLogger events the old way (json.dumps with
+indent=2 embedded in a text line) and with the compact encodings: text lines
+with single-line JSON and JSON lines, each with the stdlib encoder and, when
+installed, orjson. Reports the cost of building and formatting one record and
+the bytes it adds to the log file. No files are written.
+
+Usage:
+    python scripts/benchmark_logging.py [--events 20000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def sample_events():
+    """(logger, message, event) triples shaped like what the middleware and ComplianceLogger emit"""
+    try:
+        raise ValueError("Vendor not found")
+    except ValueError:
+        stack = traceback.format_exc()
+    now = datetime.utcnow().isoformat()
+    return [
+        ("performance", "Performance", {
+            "event_type": "PERFORMANCE_METRIC", "timestamp": now, "operation": "GET_/api/v1/vendors/",
+            "duration_ms": 12.31, "resource_usage": {"status_code": 200}
+        }),
+        ("security", "Authentication Request", {
+            "method": "POST", "url": "http://localhost:8000/api/v1/auth/login", "path": "/api/v1/auth/login",
+            "query_params": {}, "client_ip": "10.0.0.12", "user_id": None,
+            "headers": {
+                "host": "localhost:8000", "user-agent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/120.0",
+                "accept": "application/json", "content-type": "application/json", "content-length": "52",
+                "origin": "http://localhost:5173", "accept-language": "en-US,en;q=0.9"
+            },
+            "user_agent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/120.0"
+        }),
+        ("audit", "Vendor Registration", {
+            "event_type": "VENDOR_REGISTRATION", "timestamp": now, "user_id": 7, "ip_address": "10.0.0.12",
+            "vendor_email": "sales@precision-castings.example", "company_name": "Precision Castings Pvt Ltd",
+            "country_origin": "IN", "supplier_type": "manufacturer",
+            "compliance_data": {"pan_number": "ABCDE1234F", "gst_number": "27ABCDE1234F1Z5", "msme_status": "pending"},
+            "agreements_accepted": {"nda": True, "sqa": True, "four_m": False, "code_of_conduct": True,
+                                    "compliance_agreement": True, "self_declaration": True}
+        }),
+        ("error", "System Error", {
+            "event_type": "SYSTEM_ERROR", "timestamp": now, "error_type": "ValueError",
+            "error_message": "Vendor not found", "context": "Request: GET /api/v1/vendors/42", "user_id": None,
+            "stack_trace": stack
+        }),
+    ]
+
+
+def measure(events, n, make_record, formatter):
+    """(microseconds per event, bytes per event) over n events cycling through the samples"""
+    size = 0
+    start = time.perf_counter()
+    for i in range(n):
+        record = make_record(*events[i % len(events)])
+        size += len(formatter.format(record).encode("utf-8")) + 1  # newline
+    return (time.perf_counter() - start) / n * 1e6, size / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000, help="events formatted per encoding")
+    args = parser.parse_args()
+
+    # Importing the app creates (but never connects) an engine; keep it off real databases
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'unused.db')}"
+    from app.utils import logger as app_logger
+
+    def legacy_record(name, message, event):
+        return logging.LogRecord(name, logging.INFO, __file__, 0, f"{message}: {json.dumps(event, indent=2)}", None, None)
+
+    def event_record(name, message, event):
+        record = logging.LogRecord(name, logging.INFO, __file__, 0, message, None, None)
+        record.event = event
+        return record
+
+    legacy_formatter = logging.Formatter('%(asctime)s | %(name)s | %(levelname)s | %(message)s',
+                                         datefmt='%Y-%m-%d %H:%M:%S')
+    encoders = [("stdlib", app_logger.stdlib_json_dumps)]
+    if app_logger.orjson is not None:
+        encoders.append(("orjson", app_logger.json_dumps))
+
+    runs = [("legacy text, indent=2", legacy_record, legacy_formatter)]
+    for encoder, dumps in encoders:
+        runs.append((f"text, {encoder}", event_record, app_logger.EventTextFormatter(dumps)))
+        runs.append((f"json lines, {encoder}", event_record, app_logger.JsonLinesFormatter(dumps)))
+
+    events = sample_events()
+    print(f"{args.events:,} events per encoding" + ("" if app_logger.orjson else " (orjson not installed)"))
+    print(f"{'encoding':<22} {'us/event':>9} {'bytes/event':>12} {'lines/event':>12}")
+    for label, make_record, formatter in runs:
+        micros, size = measure(events, args.events, make_record, formatter)
+        lines = sum(formatter.format(make_record(*event)).count("\n") + 1 for event in events) / len(events)
+        print(f"{label:<22} {micros:>9.1f} {size:>12.0f} {lines:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
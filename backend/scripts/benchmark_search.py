@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Vendor search benchmark
+
+Loads synthetic vendors (100k and 1M by default) into a scratch database and
+compares the legacy four-way leading-wildcard ILIKE scan with the indexed
+search in app/utils/vendor_search.py.
+
+Usage:
+    python scripts/benchmark_search.py [--sizes 100000 1000000] [--repeat 5]
+    python scripts/benchmark_search.py --database-url postgresql://.../scratch_db
+
+WARNING: with --database-url the vendors table of that database is emptied.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PREFIXES = ["Amber", "Bharat", "Crescent", "Delta", "Everest", "Falcon", "Ganga", "Horizon", "Indus",
+            "Jupiter", "Kaveri", "Lotus", "Meridian", "Nova", "Orion", "Pinnacle", "Quantum", "Raja",
+            "Sagar", "Titan", "Unity", "Vertex", "Western", "Yamuna", "Zenith"]
+SUFFIXES = ["Industries", "Components", "Electricals", "Plastics", "Castings", "Logistics", "Polymers",
+            "Engineering", "Metals", "Traders", "Tooling", "Exports", "Systems", "Fabricators"]
+FIRST_NAMES = ["Rajesh", "Priya", "Amit", "Sunita", "Vikram", "Anjali", "Rohan", "Kavita", "Suresh", "Neha"]
+LAST_NAMES = ["Kumar", "Sharma", "Patel", "Singh", "Reddy", "Iyer", "Gupta", "Nair", "Joshi", "Mehta"]
+
+# (label, term) pairs covering prefix, mid-word, email, code and no-match searches
+SEARCH_TERMS = [
+    ("company prefix", "Meridian Pla"),
+    ("mid-word", "astings"),
+    ("contact name", "Kavita Nair"),
+    ("email fragment", "vendor12345@"),
+    ("vendor code", "VND0004242"),
+    ("no match", "qqqzzzxx"),
+]
+
+
+def synthetic_rows(start: int, count: int, rng: random.Random):
+    for i in range(start, start + count):
+        yield {
+            "vendor_code": f"VND{i:07d}",
+            "business_vertical": "manufacturing",
+            "company_name": f"{rng.choice(PREFIXES)} {rng.choice(SUFFIXES)} {i}",
+            "country_origin": "IN",
+            "contact_person_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "email": f"vendor{i}@example.com",
+            "phone_number": f"+91{rng.randint(6000000000, 9999999999)}",
+            "status": "PENDING",
+            "msme_status": "PENDING",
+        }
+
+
+def load_vendors(engine, size: int):
+    from app.models.vendor import Vendor
+
+    rng = random.Random(42)
+    batch = 20000
+    with engine.begin() as conn:
+        conn.execute(Vendor.__table__.delete())
+    start = time.perf_counter()
+    for offset in range(0, size, batch):
+        with engine.begin() as conn:
+            conn.execute(Vendor.__table__.insert(), list(synthetic_rows(offset, min(batch, size - offset), rng)))
+    return time.perf_counter() - start
+
+
+def time_queries(build_query, repeat: int):
+    durations = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(build_query().limit(25).all())
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), max(durations), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000], help="vendor counts to test")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per search term")
+    parser.add_argument("--database-url", default=None,
+                        help="scratch database to use (defaults to a temporary SQLite file per size)")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        os.environ["DATABASE_URL"] = args.database_url or \
+            f"sqlite:///{os.path.join(tempfile.mkdtemp(), f'search_{size}.db')}"
+
+        # Each size gets a fresh engine, so drop cached app modules between runs
+        for module in [name for name in sys.modules if name == "app" or name.startswith("app.")]:
+            del sys.modules[module]
+
+        from sqlalchemy import or_
+        from app.database import engine, SessionLocal, Base
+        from app.models.vendor import Vendor
+        from app.utils.vendor_search import ensure_search_index, apply_vendor_search
+
+        Base.metadata.create_all(bind=engine)
+        backend = ensure_search_index(engine)
+        load_seconds = load_vendors(engine, size)
+        db = SessionLocal()
+
+        print(f"\n{size:,} vendors on {engine.dialect.name} ({backend}), loaded in {load_seconds:.1f}s")
+        print(f"{'search':<16} {'legacy median':>14} {'indexed median':>15} {'indexed max':>12} {'rows':>5}")
+
+        for label, term in SEARCH_TERMS:
+            def legacy():
+                return db.query(Vendor).filter(or_(
+                    Vendor.company_name.ilike(f"%{term}%"),
+                    Vendor.contact_person_name.ilike(f"%{term}%"),
+                    Vendor.email.ilike(f"%{term}%"),
+                    Vendor.vendor_code.ilike(f"%{term}%")
+                )).order_by(Vendor.id)
+
+            def indexed():
+                query, order_by = apply_vendor_search(db.query(Vendor), db, term)
+                return query.order_by(*order_by, Vendor.id)
+
+            legacy_median, _, _ = time_queries(legacy, args.repeat)
+            indexed_median, indexed_max, rows = time_queries(indexed, args.repeat)
+            print(f"{label:<16} {legacy_median * 1000:>12.1f}ms {indexed_median * 1000:>13.1f}ms "
+                  f"{indexed_max * 1000:>10.1f}ms {rows:>5}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
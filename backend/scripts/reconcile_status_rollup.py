@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Rebuild the workflow status counters (status_rollups) from the vendors and
+vendor_approvals tables.
+
+The counters are kept up to date by database triggers; run this after restoring
+a backup, bulk-loading data with triggers disabled, or whenever the dashboard
+workflow counts look wrong.
+
+Usage:
+    python scripts/reconcile_status_rollup.py [--dry-run]
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, engine, Base
+from app.models.status_rollup import StatusRollup
+from app.utils.status_rollup import reconcile_status_rollup
+
+
+def snapshot(db):
+    return {(row.scope, row.key): row.count for row in db.query(StatusRollup).all()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild workflow status counters from source tables")
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without saving the rebuilt counters")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[StatusRollup.__table__])
+
+    db = SessionLocal()
+    try:
+        before = snapshot(db)
+        reconcile_status_rollup(db)
+        after = snapshot(db)
+
+        drift = sorted(
+            (key, before.get(key, 0), after.get(key, 0))
+            for key in before.keys() | after.keys()
+            if before.get(key, 0) != after.get(key, 0)
+        )
+        for (scope, key), old, new in drift:
+            print(f"{scope:<10} {key:<32} {old:>8} -> {new}")
+        print(f"{len(drift)} counter(s) {'would change' if args.dry_run else 'corrected'}")
+
+        if args.dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Reconciliation failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()